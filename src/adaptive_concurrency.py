@@ -0,0 +1,249 @@
+"""
+This module contains an AIMD (additive increase, multiplicative decrease) concurrency
+limiter for requests to the UCR registration system.
+
+Threads wrap each request in AdaptiveConcurrencyLimiter.request(); the limiter grows
+the number of in-flight requests while responses are healthy and cuts it back when
+it sees throttling (429), server errors (5xx), timeouts, or latency well above the
+baseline: an exponentially weighted moving average of recent latencies, never taken
+below an absolute floor so loopback or cached responses cannot make normal jitter
+look like congestion.
+
+request_with_retries() retries throttled, failed and timed-out requests with
+exponential backoff, taking a fresh limiter slot for every attempt.
+"""
+import random
+import time
+from contextlib import contextmanager, nullcontext
+from threading import Condition
+from typing import Callable, Dict, Iterator, Optional
+
+import requests
+
+
+# Status codes that mean the server wants us to slow down
+THROTTLE_STATUS_CODES = {429, 502, 503, 504}
+
+# Attempts per request (first try included) and the base backoff in seconds before a retry
+RETRY_ATTEMPTS = 4
+RETRY_BACKOFF = 0.5
+
+
+class AdaptiveConcurrencyLimiter:
+    def __init__(self, initial_limit: int = 4, min_limit: int = 1, max_limit: int = 20,
+                 increase_step: float = 1.0, decrease_factor: float = 0.5,
+                 latency_tolerance: float = 3.0, cooldown: float = 1.0,
+                 latency_smoothing: float = 0.1, latency_floor: float = 0.01,
+                 latency_warmup: int = 20):
+        """
+        Initialize the limiter.
+
+        Args:
+            initial_limit: Number of in-flight requests allowed at start
+            min_limit: Floor for the in-flight limit
+            max_limit: Ceiling for the in-flight limit
+            increase_step: Amount the limit grows per limit's worth of healthy responses
+            decrease_factor: Multiplier applied to the limit on a congestion signal
+            latency_tolerance: Latency over this multiple of the baseline latency counts as congestion
+            cooldown: Minimum seconds between two decreases, so one burst of errors only cuts once
+            latency_smoothing: Weight of each new response in the baseline moving average
+            latency_floor: Lowest baseline in seconds, so latencies below
+                           latency_floor * latency_tolerance never count as congestion
+            latency_warmup: Successful responses averaged into the baseline before latency
+                            can count as congestion
+        """
+        if not 1 <= min_limit <= max_limit:
+            raise ValueError("Expected 1 <= min_limit <= max_limit")
+        if not 0 < latency_smoothing <= 1:
+            raise ValueError("Expected 0 < latency_smoothing <= 1")
+
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance
+        self.cooldown = cooldown
+        self.latency_smoothing = latency_smoothing
+        self.latency_floor = latency_floor
+        self.latency_warmup = latency_warmup
+
+        self._limit = float(min(max(initial_limit, min_limit), max_limit))
+        self._in_flight = 0
+        self._baseline_latency: Optional[float] = None
+        self._last_decrease = float('-inf')
+        self._condition = Condition()
+        self.stats = {"successes": 0, "errors": 0, "throttled": 0, "timeouts": 0,
+                      "increases": 0, "decreases": 0, "retries": 0}
+
+    @property
+    def limit(self) -> int:
+        """Current number of requests allowed in flight."""
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        """Number of requests currently in flight."""
+        return self._in_flight
+
+    def acquire(self) -> None:
+        """Block until a request slot is free under the current limit."""
+        with self._condition:
+            while self._in_flight >= int(self._limit):
+                self._condition.wait()
+            self._in_flight += 1
+
+    def release(self) -> None:
+        """Return a request slot."""
+        with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
+
+    def record_success(self, latency: float) -> None:
+        """
+        Record a healthy response.
+
+        Args:
+            latency: Response time in seconds
+        """
+        with self._condition:
+            self.stats["successes"] += 1
+
+            if self._baseline_latency is None:
+                self._baseline_latency = latency
+            congested = (self.stats["successes"] > self.latency_warmup and
+                         latency > max(self._baseline_latency, self.latency_floor) * self.latency_tolerance)
+            self._baseline_latency += self.latency_smoothing * (latency - self._baseline_latency)
+
+            if congested:
+                self._decrease()
+                return
+
+            # Additive increase: roughly +increase_step per round trip at the current limit
+            if self._limit < self.max_limit:
+                previous_limit = self.limit
+                self._limit = min(self.max_limit, self._limit + self.increase_step / self._limit)
+                if self.limit > previous_limit:
+                    self.stats["increases"] += self.limit - previous_limit
+                    self._condition.notify_all()
+
+    def record_error(self, status_code: Optional[int] = None, timeout: bool = False) -> None:
+        """
+        Record a failed request.
+
+        Args:
+            status_code: HTTP status code of the response, if one was received
+            timeout: Whether the request timed out
+        """
+        with self._condition:
+            self.stats["errors"] += 1
+            if timeout:
+                self.stats["timeouts"] += 1
+            throttled = status_code is not None and (status_code in THROTTLE_STATUS_CODES or status_code >= 500)
+            if throttled:
+                self.stats["throttled"] += 1
+
+            # Client errors (other 4xx) say nothing about server load
+            if timeout or throttled or status_code is None:
+                self._decrease()
+
+    def record_retry(self) -> None:
+        """Count a failed request that is about to be retried."""
+        with self._condition:
+            self.stats["retries"] += 1
+
+    def _decrease(self) -> None:
+        """Multiplicatively cut the limit (caller must hold the condition lock)."""
+        now = time.monotonic()
+        if now - self._last_decrease < self.cooldown:
+            return
+        self._last_decrease = now
+        new_limit = max(self.min_limit, self._limit * self.decrease_factor)
+        if new_limit < self._limit:
+            self._limit = new_limit
+            self.stats["decreases"] += 1
+
+    @contextmanager
+    def request(self) -> Iterator[None]:
+        """
+        Hold a request slot for the duration of one HTTP request.
+
+        Latency and outcome are recorded automatically: requests exceptions are
+        classified as timeouts, HTTP errors or connection errors and re-raised.
+        """
+        self.acquire()
+        start_time = time.monotonic()
+        try:
+            yield
+        except requests.exceptions.Timeout:
+            self.record_error(timeout=True)
+            raise
+        except requests.exceptions.HTTPError as e:
+            self.record_error(status_code=e.response.status_code if e.response is not None else None)
+            raise
+        except requests.exceptions.RequestException:
+            self.record_error()
+            raise
+        else:
+            self.record_success(time.monotonic() - start_time)
+        finally:
+            self.release()
+
+    def summary(self) -> Dict[str, int]:
+        """
+        Summarize the limiter state for progress output.
+
+        Returns:
+            Dictionary with the current limit and outcome counters
+        """
+        with self._condition:
+            return {"limit": self.limit, **self.stats}
+
+
+def is_retryable(error: Exception) -> bool:
+    """
+    Check whether a failed request is worth retrying.
+
+    Args:
+        error: Exception raised by requests
+
+    Returns:
+        True for timeouts, connection errors, throttling and server errors
+    """
+    if isinstance(error, requests.exceptions.HTTPError):
+        status_code = error.response.status_code if error.response is not None else None
+        return status_code is None or status_code in THROTTLE_STATUS_CODES or status_code >= 500
+    return isinstance(error, (requests.exceptions.Timeout, requests.exceptions.ConnectionError))
+
+
+def request_with_retries(send: Callable[[], requests.Response],
+                         limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+                         attempts: int = RETRY_ATTEMPTS, backoff: float = RETRY_BACKOFF) -> requests.Response:
+    """
+    Send a request, retrying retryable failures with exponential backoff.
+
+    Each attempt holds its own limiter slot, so failures are recorded and the limit
+    can shrink before the retry; the backoff sleep happens without holding a slot.
+
+    Args:
+        send: Function that sends the request and raises for bad statuses
+              (e.g., calls response.raise_for_status())
+        limiter: Optional limiter to hold a slot from for each attempt
+        attempts: Maximum number of attempts, the first included
+        backoff: Base delay in seconds; doubles after every failed attempt, with jitter
+
+    Returns:
+        The successful response
+
+    Raises:
+        The last exception once attempts run out, or any non-retryable exception
+    """
+    for attempt in range(attempts):
+        try:
+            with limiter.request() if limiter else nullcontext():
+                return send()
+        except requests.exceptions.RequestException as e:
+            if attempt + 1 == attempts or not is_retryable(e):
+                raise
+            if limiter:
+                limiter.record_retry()
+            time.sleep(backoff * 2 ** attempt * random.uniform(0.5, 1.5))
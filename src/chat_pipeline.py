@@ -0,0 +1,380 @@
+"""
+This module orchestrates one chatbot turn with asyncio.
+
+The Groq call that extracts preferences from the student's message takes seconds, so
+the catalog work runs behind it instead of after it:
+
+1. The LLM extraction starts immediately in a worker thread.
+2. Cheap regex hints (course codes, "no Fridays", "after 10am") and the student
+   profile give partial constraints right away; the relevant subject files are
+   loaded and prerequisite eligibility is checked while the LLM call is in flight.
+3. A speculative schedule search starts on the partial constraints and its results
+   are streamed to the caller.
+4. When the LLM answers, the constraints are merged. If they changed, the
+   speculative search is cancelled and a new one streams the final schedules.
+
+run_turn() is an async generator of event dictionaries with a "type" of
+"constraints", "schedule", "reset" or "done".
+"""
+import asyncio
+import json
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional
+
+from prerequisite_parser import parse_prerequisites, prerequisites_satisfied
+from scheduler import describe_schedule, generate_schedules
+from section_table import SUBJECTS_DIR, DAY_BITS, SectionTable, load_subjects
+
+
+GROQ_MODEL = "llama-3.1-8b-instant"
+
+EXTRACTION_PROMPT = """Extract the student's course scheduling preferences from their message.
+Reply with a JSON object using only these keys (omit unknown values):
+- "course_ids": list of course ids like "CS010A" (subject code + zero-padded number + suffix)
+- "earliest_start": earliest class start as "HHMM" (24-hour)
+- "latest_end": latest class end as "HHMM" (24-hour)
+- "avoid_days": list of days to avoid using M, T, W, R, F, S, U
+- "methods": list of instruction methods from "In-Person", "Online", "Hybrid"
+- "open_only": true if the student only wants sections with open seats"""
+
+COURSE_CODE_PATTERN = re.compile(r'\b([A-Z]{2,4})\s?0*(\d{1,3})([A-Z]{0,2})\b')
+DAY_NAME_PATTERN = re.compile(
+    r"\b(?:no|not on|avoid|without|free on)\s+(monday|tuesday|wednesday|thursday|friday|saturday|sunday)s?\b",
+    re.IGNORECASE)
+AFTER_PATTERN = re.compile(
+    r'\b(?:after|(?:not|nothing|no classes) before|start(?:ing)? at)\s+(\d{1,2})(?::(\d{2}))?\s*(am|pm)?',
+    re.IGNORECASE)
+BEFORE_PATTERN = re.compile(
+    r'(?<!not )(?<!nothing )(?<!classes )\b(?:before|end(?:ing)? by|done by|until)\s+(\d{1,2})(?::(\d{2}))?\s*(am|pm)?',
+    re.IGNORECASE)
+
+DAY_NAMES = {'monday': 'M', 'tuesday': 'T', 'wednesday': 'W', 'thursday': 'R',
+             'friday': 'F', 'saturday': 'S', 'sunday': 'U'}
+
+CONSTRAINT_KEYS = ('course_ids', 'earliest_start', 'latest_end', 'avoid_days', 'methods', 'open_only')
+
+# Sentinel pushed onto a search queue when the search thread finishes
+_SEARCH_DONE = object()
+
+
+def extract_preferences_with_groq(message: str, model: str = GROQ_MODEL) -> Dict[str, Any]:
+    """
+    Extract scheduling constraints from a message with the Groq API.
+
+    Args:
+        message: Student's chat message
+        model: Groq model name
+
+    Returns:
+        Constraint dictionary (see CONSTRAINT_KEYS)
+    """
+    from dotenv import load_dotenv
+    from groq import Groq
+
+    load_dotenv()
+    client = Groq(api_key=os.environ.get("GROQ_API_KEY"))
+    completion = client.chat.completions.create(
+        model=model,
+        messages=[
+            {"role": "system", "content": EXTRACTION_PROMPT},
+            {"role": "user", "content": message},
+        ],
+        response_format={"type": "json_object"},
+        temperature=0,
+    )
+    extracted = json.loads(completion.choices[0].message.content)
+    return {key: value for key, value in extracted.items() if key in CONSTRAINT_KEYS}
+
+
+def _clock_to_hhmm(hour: str, minute: Optional[str], meridiem: Optional[str]) -> str:
+    """Convert a matched clock time (e.g., "2", None, "pm") into "HHMM"."""
+    hours = int(hour) % 12 if meridiem else int(hour)
+    if meridiem and meridiem.lower() == 'pm':
+        hours += 12
+    elif not meridiem and hours < 8:
+        # "after 2" in a class schedule means the afternoon
+        hours += 12
+    return f"{hours:02d}{int(minute or 0):02d}"
+
+
+def quick_extract(message: str, known_subjects: Iterable[str]) -> Dict[str, Any]:
+    """
+    Extract partial constraints from a message with regular expressions.
+
+    Args:
+        message: Student's chat message
+        known_subjects: Subject codes that exist in the catalog
+
+    Returns:
+        Constraint dictionary containing whatever could be recognized
+    """
+    known = set(known_subjects)
+    constraints: Dict[str, Any] = {}
+
+    course_ids = [f"{subject}{int(number):03d}{suffix}"
+                  for subject, number, suffix in COURSE_CODE_PATTERN.findall(message.upper())
+                  if subject in known]
+    if course_ids:
+        constraints['course_ids'] = list(dict.fromkeys(course_ids))
+
+    avoid_days = [DAY_NAMES[day.lower()] for day in DAY_NAME_PATTERN.findall(message)]
+    if avoid_days:
+        constraints['avoid_days'] = list(dict.fromkeys(avoid_days))
+
+    after = AFTER_PATTERN.search(message)
+    if after:
+        constraints['earliest_start'] = _clock_to_hhmm(*after.groups())
+    before = BEFORE_PATTERN.search(message)
+    if before:
+        constraints['latest_end'] = _clock_to_hhmm(*before.groups())
+
+    lowered = message.lower()
+    if 'in-person' in lowered or 'in person' in lowered:
+        constraints['methods'] = ['In-Person']
+    elif 'online' in lowered:
+        constraints['methods'] = ['Online']
+    if 'open seat' in lowered or 'not full' in lowered:
+        constraints['open_only'] = True
+
+    return constraints
+
+
+def merge_constraints(*sources: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Merge constraint dictionaries; later sources override earlier ones when they set a value.
+
+    Returns:
+        Merged constraint dictionary
+    """
+    merged: Dict[str, Any] = {}
+    for source in sources:
+        for key, value in (source or {}).items():
+            if key in CONSTRAINT_KEYS and value not in (None, [], ""):
+                merged[key] = value
+    return merged
+
+
+class ChatTurnPipeline:
+    def __init__(self, extractor: Callable[[str], Dict[str, Any]] = extract_preferences_with_groq,
+                 subjects_dir=None, schedule_limit: int = 5):
+        """
+        Initialize the pipeline.
+
+        Args:
+            extractor: Blocking function turning a message into constraints (the LLM call)
+            subjects_dir: Directory containing [SUBJECT].json files (defaults to data/processed/subjects)
+            schedule_limit: Maximum schedules streamed per turn
+        """
+        self.extractor = extractor
+        self.subjects_dir = Path(subjects_dir) if subjects_dir else SUBJECTS_DIR
+        self.schedule_limit = schedule_limit
+        self.known_subjects = sorted(path.stem for path in self.subjects_dir.glob('*.json'))
+
+        # Subject files loaded so far; shared across turns
+        self._subjects: Dict[str, Dict[str, Any]] = {}
+        self._loading: Dict[str, asyncio.Task] = {}
+
+    async def prefetch_subjects(self, subjects: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Load subject files in worker threads, reusing files loaded by earlier turns.
+
+        Args:
+            subjects: Subject codes to load (unknown codes are ignored)
+
+        Returns:
+            Dictionary of the requested subjects' course data
+        """
+        wanted = [subject for subject in dict.fromkeys(subjects) if subject in self.known_subjects]
+        for subject in wanted:
+            if subject not in self._subjects and subject not in self._loading:
+                self._loading[subject] = asyncio.create_task(
+                    asyncio.to_thread(load_subjects, self.subjects_dir, [subject]))
+
+        for subject in wanted:
+            if subject not in self._subjects:
+                self._subjects.update(await self._loading[subject])
+                self._loading.pop(subject, None)
+
+        return {subject: self._subjects[subject] for subject in wanted}
+
+    @staticmethod
+    def _requested_courses(constraints: Dict[str, Any], profile: Dict[str, Any]) -> List[str]:
+        """Courses to schedule: the ones named in the message, otherwise the profile's required courses."""
+        return constraints.get('course_ids') or profile.get('required_courses', [])
+
+    def _subjects_for(self, constraints: Dict[str, Any], profile: Dict[str, Any]) -> List[str]:
+        """Subject codes needed for the requested courses and the student's majors."""
+        subjects = list(profile.get('major_subjects', []))
+        for course_id in self._requested_courses(constraints, profile):
+            match = re.match(r'[A-Z]+', course_id)
+            if match:
+                subjects.append(match.group())
+        return subjects
+
+    @staticmethod
+    def eligible_courses(subjects: Dict[str, Dict[str, Any]], course_ids: Iterable[str],
+                         completed_courses: Iterable[str]) -> List[str]:
+        """
+        Keep the courses whose prerequisites are met and which are not already completed.
+
+        Args:
+            subjects: Loaded subject data
+            course_ids: Candidate course ids
+            completed_courses: Completed course ids
+
+        Returns:
+            Eligible course ids, in the order given
+        """
+        completed = set(completed_courses)
+        courses = {course_id: course for subject in subjects.values() for course_id, course in subject.items()}
+        eligible = []
+        for course_id in course_ids:
+            course = courses.get(course_id)
+            if course is None or course_id in completed:
+                continue
+            parsed = course.get('prerequisites_parsed') or parse_prerequisites(course['prerequisites'])
+            if prerequisites_satisfied(parsed['groups'], completed):
+                eligible.append(course_id)
+        return eligible
+
+    async def _stream_search(self, subjects: Dict[str, Dict[str, Any]], course_ids: List[str],
+                             constraints: Dict[str, Any], stop: threading.Event) -> AsyncIterator[List[Dict]]:
+        """Run schedule generation in a thread, yielding schedules as they are found."""
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+
+        def search() -> None:
+            try:
+                table = SectionTable.from_subjects(subjects)
+                mask = table.mask(
+                    methods=constraints.get('methods'),
+                    exclude_days=[day for day in constraints.get('avoid_days', []) if day in DAY_BITS],
+                    start_after=constraints.get('earliest_start'),
+                    end_before=constraints.get('latest_end'),
+                    open_only=bool(constraints.get('open_only')),
+                )
+                for rows in generate_schedules(table, course_ids, mask, limit=self.schedule_limit):
+                    if stop.is_set():
+                        break
+                    loop.call_soon_threadsafe(queue.put_nowait, describe_schedule(table, rows))
+            finally:
+                loop.call_soon_threadsafe(queue.put_nowait, _SEARCH_DONE)
+
+        worker = asyncio.create_task(asyncio.to_thread(search))
+        try:
+            while True:
+                schedule = await queue.get()
+                if schedule is _SEARCH_DONE:
+                    break
+                yield schedule
+        finally:
+            stop.set()
+            await worker
+
+    async def _plan(self, constraints: Dict[str, Any], profile: Dict[str, Any]):
+        """Prefetch data, check eligibility and return (subjects, eligible course ids)."""
+        subjects = await self.prefetch_subjects(self._subjects_for(constraints, profile))
+        course_ids = self._requested_courses(constraints, profile)
+        eligible = self.eligible_courses(subjects, course_ids, profile.get('completed_courses', []))
+        return subjects, eligible
+
+    async def run_turn(self, message: str, profile: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Process one chat message, streaming events as results become available.
+
+        Args:
+            message: Student's chat message
+            profile: Student profile (completed_courses, required_courses, major_subjects, preferences)
+
+        Yields:
+            Event dictionaries:
+            - {"type": "constraints", "final": bool, "constraints": {...}, "eligible_courses": [...]}
+            - {"type": "schedule", "final": bool, "sections": [...]}
+            - {"type": "reset"} when speculative schedules are superseded
+            - {"type": "done", "schedules": int}
+        """
+        llm_task = asyncio.create_task(asyncio.to_thread(self.extractor, message))
+
+        partial = merge_constraints(profile.get('preferences'), quick_extract(message, self.known_subjects))
+        subjects, eligible = await self._plan(partial, profile)
+        yield {"type": "constraints", "final": False, "constraints": partial, "eligible_courses": eligible}
+
+        # Stream speculative schedules until the LLM answers
+        stop = threading.Event()
+        speculative = self._stream_search(subjects, eligible, partial, stop)
+        streamed = 0
+        next_schedule = asyncio.ensure_future(anext(speculative, None))
+        while not llm_task.done():
+            finished, _ = await asyncio.wait({next_schedule, llm_task}, return_when=asyncio.FIRST_COMPLETED)
+            if next_schedule not in finished:
+                break
+            sections = next_schedule.result()
+            if sections is None:
+                break
+            streamed += 1
+            yield {"type": "schedule", "final": False, "sections": sections}
+            next_schedule = asyncio.ensure_future(anext(speculative, None))
+
+        try:
+            extracted = await llm_task
+        except Exception as e:
+            print(f"Error extracting preferences: {e}")
+            extracted = {}
+
+        final = merge_constraints(partial, extracted)
+        restart = final != partial
+        if restart:
+            # The speculative search used stale constraints; stop it and plan again
+            stop.set()
+            next_schedule.cancel()
+            await asyncio.gather(next_schedule, return_exceptions=True)
+            await speculative.aclose()
+            if streamed:
+                yield {"type": "reset"}
+            streamed = 0
+            subjects, eligible = await self._plan(final, profile)
+
+        yield {"type": "constraints", "final": True, "constraints": final, "eligible_courses": eligible}
+
+        if restart:
+            stop = threading.Event()
+            async for sections in self._stream_search(subjects, eligible, final, stop):
+                streamed += 1
+                yield {"type": "schedule", "final": True, "sections": sections}
+        else:
+            # The speculative search was right; keep streaming it
+            sections = await next_schedule
+            while sections is not None:
+                streamed += 1
+                yield {"type": "schedule", "final": True, "sections": sections}
+                sections = await anext(speculative, None)
+
+        yield {"type": "done", "schedules": streamed}
+
+
+if __name__ == "__main__":
+    import time
+
+    def slow_stub_extractor(message: str) -> Dict[str, Any]:
+        """Stand-in for the Groq call with a realistic round-trip time."""
+        time.sleep(2.0)
+        return {"course_ids": ["CS010A", "MATH009A"], "avoid_days": ["F"], "earliest_start": "1000"}
+
+    async def demo() -> None:
+        pipeline = ChatTurnPipeline(extractor=slow_stub_extractor, schedule_limit=3)
+        profile = {"completed_courses": ["CS005", "MATH005A"], "major_subjects": ["CS"]}
+        message = "I need CS 10A and Math 9A, no Fridays, nothing before 10am"
+
+        start_time = time.perf_counter()
+        async for event in pipeline.run_turn(message, profile):
+            elapsed = time.perf_counter() - start_time
+            if event["type"] == "schedule":
+                crns = ", ".join(section["crn"] for section in event["sections"])
+                print(f"[{elapsed:.2f}s] schedule ({'final' if event['final'] else 'speculative'}): {crns}")
+            else:
+                print(f"[{elapsed:.2f}s] {event}")
+
+    asyncio.run(demo())
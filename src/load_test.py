@@ -0,0 +1,365 @@
+"""
+This module load-tests the chatbot planning path with concurrent simulated sessions.
+
+Each session is a mock student (see mock_students.py) sending one chat message through
+ChatTurnPipeline.run_turn: regex extraction, subject loading, prerequisite eligibility,
+section filtering and schedule search all run for real, while the Groq call is replaced
+by a stub that sleeps for a sampled LLM latency and returns the constraints the message
+was written from. Some messages phrase a preference in a way the regex hints miss, so
+the speculative search is cancelled and restarted just as with real LLM answers.
+
+Sessions run at a fixed concurrency level, and each level reports throughput,
+p50/p95/p99 turn latency, time to first schedule and memory use.
+"""
+import asyncio
+import random
+import resource
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from chat_pipeline import ChatTurnPipeline
+from mock_students import StudentGenerator
+from section_table import load_subjects
+
+
+PERCENTILES = (50, 95, 99)
+
+# Preferences stated in ways the regex hints do not recognize, with what the LLM extracts
+REPHRASINGS = (
+    ("I'm not a morning person", {"earliest_start": "1100"}),
+    ("I work in the evenings", {"latest_end": "1700"}),
+    ("I'd love a long weekend", {"avoid_days": ["F"]}),
+    ("I want to meet my professors face to face", {"methods": ["In-Person"]}),
+)
+
+DAY_WORDS = {'M': 'Mondays', 'T': 'Tuesdays', 'W': 'Wednesdays', 'R': 'Thursdays',
+             'F': 'Fridays', 'S': 'Saturdays', 'U': 'Sundays'}
+
+# Courses mentioned in one session message
+COURSES_PER_MESSAGE = (1, 2, 3)
+
+
+def _spoken_time(hhmm: str) -> str:
+    """Format "HHMM" the way a student would type it (e.g., "1330" -> "1:30pm")."""
+    hours, minutes = int(hhmm[:2]), int(hhmm[2:])
+    suffix = 'am' if hours < 12 else 'pm'
+    hours = hours % 12 or 12
+    return f"{hours}:{minutes:02d}{suffix}" if minutes else f"{hours}{suffix}"
+
+
+def _spoken_course(course_id: str, subject: str) -> str:
+    """Format a course id the way a student would type it (e.g., "CS010A" -> "CS 10A")."""
+    number = course_id[len(subject):]
+    return f"{subject} {number.lstrip('0') or '0'}"
+
+
+def build_session(profile: Dict[str, Any], rng: random.Random,
+                  rephrase_rate: float = 0.3) -> Tuple[str, Dict[str, Any]]:
+    """
+    Write a chat message for a student and the constraints an LLM would extract from it.
+
+    Args:
+        profile: Student profile from mock_students
+        rng: Random number generator
+        rephrase_rate: Probability of adding a preference the regex hints miss
+
+    Returns:
+        (message, constraints) tuple
+    """
+    constraints: Dict[str, Any] = {}
+    parts = []
+
+    required = profile.get('required_courses', [])
+    if required:
+        course_ids = rng.sample(required, min(rng.choice(COURSES_PER_MESSAGE), len(required)))
+        constraints['course_ids'] = course_ids
+        subject = profile['major']
+        parts.append(f"I need {' and '.join(_spoken_course(course_id, subject) for course_id in course_ids)}")
+    else:
+        parts.append("What should I take next quarter")
+
+    preferences = profile.get('preferences', {})
+    if preferences.get('avoid_days'):
+        constraints['avoid_days'] = list(preferences['avoid_days'])
+        parts.append(' or '.join(f"no {DAY_WORDS[day]}" for day in preferences['avoid_days']))
+    if preferences.get('earliest_start'):
+        constraints['earliest_start'] = preferences['earliest_start']
+        parts.append(f"nothing before {_spoken_time(preferences['earliest_start'])}")
+    if preferences.get('latest_end'):
+        constraints['latest_end'] = preferences['latest_end']
+        parts.append(f"done by {_spoken_time(preferences['latest_end'])}")
+
+    if rng.random() < rephrase_rate:
+        phrase, extracted = rng.choice(REPHRASINGS)
+        constraints.update(extracted)
+        parts.append(phrase)
+
+    return ', '.join(parts) + '.', constraints
+
+
+class StubExtractor:
+    def __init__(self, latency: float = 0.8, jitter: float = 0.3, seed: Optional[int] = None):
+        """
+        Stand-in for extract_preferences_with_groq.
+
+        Args:
+            latency: Median simulated LLM round trip in seconds
+            jitter: Sigma of the log-normal latency distribution (0 for a fixed latency)
+            seed: Random seed for the latency samples
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.responses: Dict[str, Dict[str, Any]] = {}
+        self.calls = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def expect(self, message: str, constraints: Dict[str, Any]) -> None:
+        """Register the constraints to return for a message."""
+        self.responses[message] = constraints
+
+    def __call__(self, message: str) -> Dict[str, Any]:
+        with self._lock:
+            self.calls += 1
+            delay = self.latency * (self._rng.lognormvariate(0.0, self.jitter) if self.jitter else 1.0)
+        time.sleep(delay)
+        return dict(self.responses.get(message, {}))
+
+
+async def run_session(pipeline: ChatTurnPipeline, profile: Dict[str, Any], message: str) -> Dict[str, Any]:
+    """
+    Run one chat turn and time it.
+
+    Args:
+        pipeline: Shared ChatTurnPipeline
+        profile: Student profile
+        message: Chat message
+
+    Returns:
+        Dictionary with latency, first_schedule (seconds, None if no schedule),
+        schedules, restarted (the LLM changed the speculative constraints) and error
+    """
+    start = time.perf_counter()
+    result = {'latency': None, 'first_schedule': None, 'schedules': 0, 'restarted': False, 'error': None}
+    partial = None
+    try:
+        async for event in pipeline.run_turn(message, profile):
+            if event['type'] == 'schedule' and result['first_schedule'] is None:
+                result['first_schedule'] = time.perf_counter() - start
+            elif event['type'] == 'constraints':
+                if event['final']:
+                    result['restarted'] = event['constraints'] != partial
+                else:
+                    partial = event['constraints']
+            elif event['type'] == 'done':
+                result['schedules'] = event['schedules']
+    except Exception as e:
+        result['error'] = repr(e)
+    result['latency'] = time.perf_counter() - start
+    return result
+
+
+async def run_level(pipeline: ChatTurnPipeline, sessions: List[Tuple[Dict[str, Any], str]],
+                    concurrency: int) -> Tuple[List[Dict[str, Any]], float]:
+    """
+    Run sessions with at most `concurrency` turns in flight.
+
+    Args:
+        pipeline: Shared ChatTurnPipeline
+        sessions: (profile, message) pairs
+        concurrency: Maximum concurrent sessions
+
+    Returns:
+        (session results, wall time in seconds) tuple
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def limited(profile: Dict[str, Any], message: str) -> Dict[str, Any]:
+        async with semaphore:
+            return await run_session(pipeline, profile, message)
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(limited(profile, message) for profile, message in sessions))
+    return list(results), time.perf_counter() - start
+
+
+def _percentiles(values: List[float]) -> Dict[str, Optional[float]]:
+    """p50/p95/p99 of a list of seconds (None if empty)."""
+    if not values:
+        return {f"p{p}": None for p in PERCENTILES}
+    return {f"p{p}": float(value) for p, value in zip(PERCENTILES, np.percentile(values, PERCENTILES))}
+
+
+def summarize(results: List[Dict[str, Any]], wall_time: float, concurrency: int) -> Dict[str, Any]:
+    """
+    Aggregate session results for one concurrency level.
+
+    Args:
+        results: Output of run_level()
+        wall_time: Wall time of the level in seconds
+        concurrency: Concurrency level
+
+    Returns:
+        Summary dictionary
+    """
+    completed = [result for result in results if result['error'] is None]
+    return {
+        'concurrency': concurrency,
+        'sessions': len(results),
+        'errors': len(results) - len(completed),
+        'wall_time': wall_time,
+        'throughput': len(completed) / wall_time if wall_time else 0.0,
+        'latency': _percentiles([result['latency'] for result in completed]),
+        'first_schedule': _percentiles([result['first_schedule'] for result in completed
+                                        if result['first_schedule'] is not None]),
+        'restart_rate': sum(result['restarted'] for result in completed) / len(completed) if completed else 0.0,
+        'mean_schedules': sum(result['schedules'] for result in completed) / len(completed) if completed else 0.0,
+    }
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB (ru_maxrss is KB on Linux)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def run_load_test(concurrency_levels: Iterable[int], sessions_per_level: int = 200,
+                        llm_latency: float = 0.8, llm_jitter: float = 0.3, rephrase_rate: float = 0.3,
+                        schedule_limit: int = 5, threads: Optional[int] = None,
+                        trace_memory: bool = False, seed: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Run the load test at each concurrency level.
+
+    Args:
+        concurrency_levels: Concurrent session counts to test
+        sessions_per_level: Sessions replayed at each level
+        llm_latency: Median stub LLM latency in seconds
+        llm_jitter: Log-normal sigma of the stub LLM latency
+        rephrase_rate: Share of messages with a preference only the LLM recognizes
+        schedule_limit: Maximum schedules streamed per turn
+        threads: Worker threads for blocking work (defaults to 2 per session of the
+                 highest level, since each in-flight turn holds one for the LLM call
+                 and one for its schedule search)
+        trace_memory: Also report the Python allocation peak per level (slower)
+        seed: Random seed for students, messages and latencies
+
+    Returns:
+        List of summary dictionaries, one per level
+    """
+    levels = sorted(set(concurrency_levels))
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=threads or 2 * max(levels) + 4)
+    loop.set_default_executor(executor)
+
+    rng = random.Random(seed)
+    generator = StudentGenerator(load_subjects(), seed)
+    extractor = StubExtractor(llm_latency, llm_jitter, seed)
+    pipeline = ChatTurnPipeline(extractor=extractor, schedule_limit=schedule_limit)
+
+    sessions = []
+    for profile in generator.generate_many(sessions_per_level):
+        message, constraints = build_session(profile, rng, rephrase_rate)
+        extractor.expect(message, constraints)
+        sessions.append((profile, message))
+
+    # Load every subject file up front so levels measure steady-state turns
+    await pipeline.prefetch_subjects(pipeline.known_subjects)
+
+    summaries = []
+    for concurrency in levels:
+        if trace_memory:
+            tracemalloc.start()
+        results, wall_time = await run_level(pipeline, sessions, concurrency)
+        summary = summarize(results, wall_time, concurrency)
+        if trace_memory:
+            summary['python_peak_mb'] = tracemalloc.get_traced_memory()[1] / 2 ** 20
+            tracemalloc.stop()
+        summary['peak_rss_mb'] = peak_rss_mb()
+        summaries.append(summary)
+        print(format_summary(summary))
+
+    executor.shutdown(wait=False)
+    return summaries
+
+
+def format_summary(summary: Dict[str, Any]) -> str:
+    """One table row for a level summary."""
+    def seconds(value: Optional[float]) -> str:
+        return f"{value:6.2f}" if value is not None else "     -"
+
+    latency = summary['latency']
+    first = summary['first_schedule']
+    row = (f"{summary['concurrency']:>11} {summary['sessions']:>8} {summary['throughput']:>10.1f} "
+           f"{seconds(latency['p50'])} {seconds(latency['p95'])} {seconds(latency['p99'])} "
+           f"{seconds(first['p50'])} {seconds(first['p95'])} "
+           f"{summary['restart_rate']:>8.0%} {summary['errors']:>6} {summary['peak_rss_mb']:>8.0f}")
+    if 'python_peak_mb' in summary:
+        row += f" {summary['python_peak_mb']:>9.1f}"
+    return row
+
+
+SUMMARY_HEADER = (f"{'concurrency':>11} {'sessions':>8} {'turns/sec':>10} "
+                  f"{'p50':>6} {'p95':>6} {'p99':>6} {'1st p50':>6} {'1st p95':>6} "
+                  f"{'restarts':>8} {'errors':>6} {'rss MB':>8}")
+
+
+def max_concurrency_within(summaries: List[Dict[str, Any]], p95_limit: float) -> Optional[int]:
+    """
+    Highest tested concurrency whose p95 latency stays within a limit without errors.
+
+    Args:
+        summaries: Output of run_load_test()
+        p95_limit: p95 turn latency limit in seconds
+
+    Returns:
+        Concurrency level, or None if no level meets the limit
+    """
+    passing = [summary['concurrency'] for summary in summaries
+               if not summary['errors'] and summary['latency']['p95'] is not None
+               and summary['latency']['p95'] <= p95_limit]
+    return max(passing) if passing else None
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+    from pathlib import Path
+
+    parser = argparse.ArgumentParser(description="Load-test the chat planning pipeline with mock students")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 50, 100],
+                        help="Concurrency levels to test")
+    parser.add_argument("--sessions", type=int, default=200, help="Sessions per concurrency level")
+    parser.add_argument("--llm-latency", type=float, default=0.8, help="Median stub LLM latency in seconds")
+    parser.add_argument("--llm-jitter", type=float, default=0.3, help="Log-normal sigma of the stub LLM latency")
+    parser.add_argument("--rephrase-rate", type=float, default=0.3,
+                        help="Share of messages with a preference only the LLM recognizes")
+    parser.add_argument("--schedule-limit", type=int, default=5, help="Maximum schedules per turn")
+    parser.add_argument("--threads", type=int, default=None, help="Worker threads for blocking work")
+    parser.add_argument("--p95-limit", type=float, default=2.0, help="p95 latency target in seconds")
+    parser.add_argument("--trace-memory", action="store_true", help="Report Python allocation peaks (slower)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--output", type=Path, default=None, help="Write the level summaries to this JSON file")
+    args = parser.parse_args()
+
+    header = SUMMARY_HEADER + (f" {'py peak MB':>9}" if args.trace_memory else "")
+    print(f"Stub LLM latency: median {args.llm_latency:.2f}s, sigma {args.llm_jitter:.2f}; "
+          f"{args.sessions} sessions per level")
+    print(header)
+    summaries = asyncio.run(run_load_test(
+        args.concurrency, args.sessions, args.llm_latency, args.llm_jitter, args.rephrase_rate,
+        args.schedule_limit, args.threads, args.trace_memory, args.seed,
+    ))
+
+    supported = max_concurrency_within(summaries, args.p95_limit)
+    if supported is None:
+        print(f"No tested concurrency level kept p95 latency within {args.p95_limit:.1f}s")
+    else:
+        print(f"Highest tested concurrency with p95 latency within {args.p95_limit:.1f}s: {supported}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(summaries, f, indent=2)
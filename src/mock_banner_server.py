@@ -0,0 +1,386 @@
+"""
+This module contains a local stand-in for the UCR Banner registration endpoints.
+
+It serves the same three endpoints the scrapers use (term/search,
+searchResults/searchResults and searchResults/getSectionPrerequisites) from a
+recorded or synthetic catalog, with injectable latency, error rates, page size
+limits and session-cookie checks, so the fetchers can be benchmarked offline.
+
+Usage:
+    python src/mock_banner_server.py --latency 0.05 --error-rate 0.01
+    python src/mock_banner_server.py --subjects CS MATH --benchmark
+"""
+import html
+import json
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+from urllib.parse import parse_qs, urlsplit
+
+
+SSB_PATH = "/StudentRegistrationSsb/ssb"
+SESSION_COOKIE = "JSESSIONID"
+
+DAY_FIELDS = {'M': 'monday', 'T': 'tuesday', 'W': 'wednesday', 'R': 'thursday',
+              'F': 'friday', 'S': 'saturday', 'U': 'sunday'}
+
+
+def load_recorded_catalog(raw_file: Path) -> List[Dict[str, Any]]:
+    """
+    Load a recorded raw catalog (e.g., data/raw/course_catalog.json).
+
+    Args:
+        raw_file: Path to a JSON list of raw Banner course records
+
+    Returns:
+        List of raw course records, including their "prerequisites" text
+    """
+    with open(raw_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _credit_value(text: str) -> Union[int, float]:
+    """Parse a credit value so str() gives back the same text (e.g., "4" -> 4, "2.5" -> 2.5)."""
+    value = float(text)
+    return int(value) if value.is_integer() else value
+
+
+def synthesize_catalog(subjects: Dict[str, Dict[str, Any]], scale: int = 1) -> List[Dict[str, Any]]:
+    """
+    Rebuild raw Banner-style records from processed subject data.
+
+    Args:
+        subjects: Processed subject data (subject -> course_id -> course entry)
+        scale: Number of copies of the catalog to serve; copies get distinct CRNs
+
+    Returns:
+        List of raw course records in Banner's searchResults format
+    """
+    catalog = []
+    for copy in range(scale):
+        for subject, courses in subjects.items():
+            for course_id, course in courses.items():
+                credits = course['credits']
+                if '-' in credits:
+                    low, high = (_credit_value(value) for value in credits.split('-'))
+                    credit_fields = {'creditHours': None, 'creditHourLow': low, 'creditHourHigh': high}
+                elif credits and credits != 'TBD':
+                    credit_fields = {'creditHours': _credit_value(credits)}
+                else:
+                    credit_fields = {'creditHours': None, 'creditHourLow': 0, 'creditHourHigh': 0}
+
+                for section in course['sections']:
+                    schedule = section['schedule']
+                    meeting_time = {field: day in schedule['days'] for day, field in DAY_FIELDS.items()}
+                    meeting_time.update({
+                        'beginTime': schedule['startTime'],
+                        'endTime': schedule['endTime'],
+                        'building': schedule['building'],
+                        'room': schedule['room'],
+                    })
+                    crn = section['crn'] if copy == 0 else str(int(section['crn']) + copy * 100000)
+                    catalog.append({
+                        'subject': subject,
+                        'subjectCourse': course_id,
+                        'courseTitle': course['title'],
+                        **credit_fields,
+                        'sequenceNumber': section['section'],
+                        'courseReferenceNumber': crn,
+                        'scheduleTypeDescription': section['type'],
+                        'instructionalMethodDescription': section['method'],
+                        'enrollment': section['availability']['enrolled'],
+                        'maximumEnrollment': section['availability']['capacity'],
+                        'seatsAvailable': section['availability']['available'],
+                        'faculty': [{'displayName': section['instructor'], 'primaryIndicator': True}],
+                        'meetingsFaculty': [{'meetingTime': meeting_time}],
+                        'prerequisites': course['prerequisites'],
+                    })
+    return catalog
+
+
+def render_prerequisites(prerequisite_text: str) -> str:
+    """
+    Render a getSectionPrerequisites response body the way Banner does.
+
+    Args:
+        prerequisite_text: Prerequisite text for the section (may be empty)
+
+    Returns:
+        HTML fragment
+    """
+    if not prerequisite_text:
+        return ('<section aria-labelledby="preReqs" role="region" class="prerequisites">'
+                '<h3 id="preReqs">Prerequisites</h3>'
+                '<span class="status-bold">No prerequisite information available.</span></section>')
+    return ('<section aria-labelledby="preReqs" role="region" class="prerequisites">'
+            '<h3 id="preReqs">Prerequisites</h3>'
+            f'<pre>{html.escape(prerequisite_text, quote=False)}</pre></section>')
+
+
+class _MockHTTPServer(ThreadingHTTPServer):
+    # The default listen backlog of 5 drops connections when the threaded fetchers open
+    # many at once, and clients see the SYN retransmit as a one-second stall
+    request_queue_size = 128
+    daemon_threads = True
+
+
+class MockBannerServer:
+    def __init__(self, catalog: List[Dict[str, Any]], host: str = "127.0.0.1", port: int = 0,
+                 latency: float = 0.0, latency_jitter: float = 0.0,
+                 error_rate: float = 0.0, throttle_rate: float = 0.0,
+                 max_page_size: Optional[int] = 500, require_session: bool = True,
+                 seed: Optional[int] = None):
+        """
+        Initialize the mock server.
+
+        Args:
+            catalog: Raw course records to serve, optionally with "prerequisites" text
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+            latency: Base delay in seconds added to every response
+            latency_jitter: Extra uniformly random delay in seconds, up to this value
+            error_rate: Fraction of search/prerequisite requests answered with HTTP 500
+            throttle_rate: Fraction of search/prerequisite requests answered with HTTP 429
+            max_page_size: Largest page searchResults returns regardless of pageMaxSize
+                           (Banner caps pages at 500); None disables the cap
+            require_session: Reject searches from sessions that did not POST term/search first,
+                             by returning an empty result set like Banner does
+            seed: Random seed for reproducible latency and error injection
+        """
+        self.catalog = [{key: value for key, value in record.items() if key != 'prerequisites'}
+                        for record in catalog]
+        self.prerequisites = {record.get('courseReferenceNumber'): record.get('prerequisites', '')
+                              for record in catalog}
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.max_page_size = max_page_size
+        self.require_session = require_session
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.sessions: Dict[str, Optional[str]] = {}
+        self.request_counts: Dict[str, int] = {}
+
+        self._server = _MockHTTPServer((host, port), self._make_handler())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        """Root URL to pass as base_url to the scrapers."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'MockBannerServer':
+        """Start serving on a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and release the socket."""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self) -> 'MockBannerServer':
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _draw(self) -> tuple:
+        """Draw the injected delay and failure status for one request."""
+        with self._lock:
+            delay = self.latency + self._random.uniform(0, self.latency_jitter)
+            roll = self._random.random()
+        if roll < self.throttle_rate:
+            return delay, 429
+        if roll < self.throttle_rate + self.error_rate:
+            return delay, 500
+        return delay, None
+
+    def _count(self, endpoint: str) -> None:
+        with self._lock:
+            self.request_counts[endpoint] = self.request_counts.get(endpoint, 0) + 1
+
+    def _search_results(self, session_term: Optional[str], query: Dict[str, str]) -> Dict[str, Any]:
+        """Build a searchResults JSON payload."""
+        term = query.get('txt_term')
+        if self.require_session and session_term != term:
+            return {'success': False, 'totalCount': 0, 'data': None}
+
+        offset = int(query.get('pageOffset', 0))
+        size = int(query.get('pageMaxSize', 10))
+        if self.max_page_size:
+            size = min(size, self.max_page_size)
+        return {
+            'success': True,
+            'totalCount': len(self.catalog),
+            'data': self.catalog[offset:offset + size],
+            'pageOffset': offset,
+            'pageMaxSize': size,
+        }
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                pass
+
+            def _session_id(self) -> Optional[str]:
+                for part in self.headers.get('Cookie', '').split(';'):
+                    name, _, value = part.strip().partition('=')
+                    if name == SESSION_COOKIE and value in server.sessions:
+                        return value
+                return None
+
+            def _send(self, status: int, body: str, content_type: str = "application/json",
+                      cookie: Optional[str] = None) -> None:
+                payload = body.encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', f'{content_type}; charset=UTF-8')
+                self.send_header('Content-Length', str(len(payload)))
+                if cookie:
+                    self.send_header('Set-Cookie', f'{SESSION_COOKIE}={cookie}; Path=/')
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _new_session(self) -> str:
+                session_id = uuid.uuid4().hex
+                with server._lock:
+                    server.sessions[session_id] = None
+                return session_id
+
+            def do_GET(self):
+                url = urlsplit(self.path)
+                query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+                server._count(url.path)
+
+                if url.path in ("", "/"):
+                    self._send(200, "<html><body>Mock Banner</body></html>", "text/html",
+                               cookie=self._new_session())
+                    return
+
+                delay, failure = server._draw()
+                time.sleep(delay)
+                if failure:
+                    self._send(failure, json.dumps({'success': False}))
+                    return
+
+                session_id = self._session_id()
+                if url.path == f"{SSB_PATH}/searchResults/searchResults":
+                    payload = server._search_results(server.sessions.get(session_id), query)
+                    self._send(200, json.dumps(payload))
+                elif url.path == f"{SSB_PATH}/searchResults/getSectionPrerequisites":
+                    if server.require_session and session_id is None:
+                        self._send(401, "Unauthorized", "text/html")
+                        return
+                    text = server.prerequisites.get(query.get('courseReferenceNumber'), '')
+                    self._send(200, render_prerequisites(text), "text/html")
+                else:
+                    self._send(404, json.dumps({'success': False}))
+
+            def do_POST(self):
+                url = urlsplit(self.path)
+                length = int(self.headers.get('Content-Length', 0))
+                form = {key: values[-1] for key, values in parse_qs(self.rfile.read(length).decode()).items()}
+                server._count(url.path)
+
+                if url.path != f"{SSB_PATH}/term/search":
+                    self._send(404, json.dumps({'success': False}))
+                    return
+
+                session_id = self._session_id()
+                cookie = None
+                if session_id is None:
+                    session_id = cookie = self._new_session()
+                with server._lock:
+                    server.sessions[session_id] = form.get('term')
+                self._send(200, json.dumps({'fwdURL': f"{SSB_PATH}/classSearch/classSearch"}),
+                           cookie=cookie)
+
+        return Handler
+
+
+def run_benchmark(server: MockBannerServer, term: str = "202440") -> None:
+    """
+    Run the serial and threaded fetchers against a running mock server and report throughput.
+
+    Args:
+        server: Started MockBannerServer
+        term: Term code to request
+    """
+    import scraper
+    import scraper_parallel
+
+    fetchers = {
+        "serial": lambda: scraper.fetch_course_data(term, base_url=server.base_url),
+        "threaded": lambda: scraper_parallel.fetch_course_data(term, base_url=server.base_url),
+    }
+
+    results = {}
+    for name, fetch in fetchers.items():
+        server.request_counts.clear()
+        start_time = time.perf_counter()
+        courses = fetch()
+        elapsed = time.perf_counter() - start_time
+        requests_made = sum(server.request_counts.values())
+        with_prerequisites = sum(1 for course in courses if course.get('prerequisites'))
+        results[name] = (len(courses), with_prerequisites, elapsed, requests_made)
+
+    print("\nBenchmark results:")
+    for name, (count, with_prerequisites, elapsed, requests_made) in results.items():
+        print(f"  {name}: {count} courses ({with_prerequisites} with prerequisites) in {elapsed:.1f}s, "
+              f"{requests_made} requests ({requests_made / elapsed:.1f} requests/sec)")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from section_table import load_subjects
+
+    parser = argparse.ArgumentParser(description="Serve a mock Banner registration API")
+    parser.add_argument("--catalog", type=Path, help="Recorded raw catalog JSON (default: synthesize from processed data)")
+    parser.add_argument("--subjects", nargs="*", help="Subjects to synthesize (default: all)")
+    parser.add_argument("--scale", type=int, default=1, help="Copies of the synthetic catalog to serve")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--latency-jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--max-page-size", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--benchmark", action="store_true", help="Run the fetchers against the server and exit")
+    args = parser.parse_args()
+
+    if args.catalog:
+        catalog = load_recorded_catalog(args.catalog)
+    else:
+        catalog = synthesize_catalog(load_subjects(subjects=args.subjects), scale=args.scale)
+
+    mock = MockBannerServer(catalog, port=args.port, latency=args.latency,
+                            latency_jitter=args.latency_jitter, error_rate=args.error_rate,
+                            throttle_rate=args.throttle_rate, max_page_size=args.max_page_size,
+                            seed=args.seed)
+    with mock:
+        print(f"Serving {len(catalog)} courses at {mock.base_url}")
+        if args.benchmark:
+            run_benchmark(mock)
+        else:
+            print(f"Set UCR_BANNER_BASE_URL={mock.base_url} to point the scrapers here (Ctrl+C to stop)")
+            try:
+                while True:
+                    time.sleep(1)
+            except KeyboardInterrupt:
+                pass
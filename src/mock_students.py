@@ -0,0 +1,274 @@
+"""
+This module generates synthetic student profiles from the processed course data.
+
+Each student gets a major (a subject code, weighted by how many undergraduate courses
+the subject offers) and a number of completed quarters. Course history is simulated
+quarter by quarter: a course can only be taken once every one of its prerequisite
+groups has a course completed in an earlier quarter, so completed courses are always
+consistent with the parsed prerequisite text. Courses that only appear as prerequisites
+(not offered this term) have unknown prerequisites and are treated as entry-level.
+
+Profiles use the same dictionary shape as recommender.py and chat_pipeline.py:
+    {
+        "student_id": "S00001",
+        "major": "CS",
+        "year": 2,
+        "major_subjects": ["CS"],
+        "completed_courses": ["MATH005A", "CS010A", ...],
+        "required_courses": ["CS010C", "CS011", ...],
+        "preferences": {"earliest_start": "1000", "latest_end": None,
+                        "avoid_days": ["F"], "instructors": []}
+    }
+"""
+import json
+import random
+import re
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from prerequisite_parser import parse_prerequisites, prerequisites_satisfied
+from section_table import load_subjects
+
+
+# Course numbers from this level up are graduate courses and never sampled
+GRADUATE_LEVEL = 200
+
+# Subjects with fewer undergraduate courses than this are not offered as majors
+MIN_MAJOR_COURSES = 10
+
+# Quarters a student may have completed (four years of fall, winter and spring)
+MAX_QUARTERS = 12
+
+COURSES_PER_QUARTER = (3, 4, 4, 4)
+
+# Random spread added to the course number when ranking eligible courses, so students
+# take mostly lower-division courses first without all following the same path
+LEVEL_JITTER = 60
+
+# Ranking bonus (in course-number units) for courses in the student's major
+MAJOR_BONUS = 40
+
+# Entry-level courses from other subjects added to each student's pool
+BREADTH_COURSES = 12
+
+# Upcoming major courses listed as required
+REQUIRED_COURSES = 6
+
+EARLIEST_START_CHOICES = (None, None, "0800", "0900", "1000", "1100")
+LATEST_END_CHOICES = (None, None, "1500", "1700", "1800", "2000")
+AVOID_DAY_CHOICES = ("M", "F", "F")
+
+COURSE_NUMBER_PATTERN = re.compile(r'^([A-Z]+?)0*(\d+)')
+
+
+def course_level(course_id: str) -> int:
+    """
+    Extract the numeric course level from a course id (e.g., "CS010A" -> 10).
+
+    Args:
+        course_id: Course id
+
+    Returns:
+        Course number, or GRADUATE_LEVEL if none can be found
+    """
+    match = COURSE_NUMBER_PATTERN.match(course_id)
+    return int(match.group(2)) if match else GRADUATE_LEVEL
+
+
+class StudentGenerator:
+    def __init__(self, subjects: Dict[str, Dict[str, Any]], seed: Optional[int] = None):
+        """
+        Index prerequisites and course levels for sampling.
+
+        Args:
+            subjects: Processed subject data (subject -> course_id -> course entry)
+            seed: Random seed for reproducible profiles
+        """
+        self.rng = random.Random(seed)
+
+        # Prerequisite groups for every known course (see get_prerequisite_groups)
+        self.prerequisites: Dict[str, List[List[str]]] = {}
+        self.subject_of: Dict[str, str] = {}
+        self.offered = set()
+        self.instructors: Dict[str, List[str]] = {}
+
+        for subject, courses in subjects.items():
+            names = set()
+            for course_id, course in courses.items():
+                parsed = course.get('prerequisites_parsed') or parse_prerequisites(course['prerequisites'])
+                self.prerequisites[course_id] = parsed['groups']
+                self.subject_of[course_id] = subject
+                self.offered.add(course_id)
+                names.update(section['instructor'] for section in course['sections'] if section['instructor'])
+            self.instructors[subject] = sorted(names)
+
+        # Courses only referenced as prerequisites were offered in earlier terms
+        for course_id, groups in list(self.prerequisites.items()):
+            for group in groups:
+                for prerequisite in group:
+                    if prerequisite not in self.prerequisites:
+                        self.prerequisites[prerequisite] = []
+                        match = COURSE_NUMBER_PATTERN.match(prerequisite)
+                        self.subject_of[prerequisite] = match.group(1) if match else ''
+
+        self.by_subject: Dict[str, List[str]] = defaultdict(list)
+        for course_id in sorted(self.prerequisites):
+            if course_level(course_id) < GRADUATE_LEVEL:
+                self.by_subject[self.subject_of[course_id]].append(course_id)
+
+        # Supporting courses: everything a major's courses list as a prerequisite
+        self.supporting: Dict[str, List[str]] = {}
+        for subject, course_ids in self.by_subject.items():
+            referenced = {prerequisite for course_id in course_ids
+                          for group in self.prerequisites[course_id] for prerequisite in group}
+            self.supporting[subject] = sorted(referenced - set(course_ids))
+
+        self.entry_level = sorted(course_id for course_ids in self.by_subject.values()
+                                  for course_id in course_ids if not self.prerequisites[course_id])
+
+        offered_counts = {subject: sum(course_id in self.offered for course_id in self.by_subject[subject])
+                          for subject in subjects}
+        self.majors = sorted(subject for subject, count in offered_counts.items() if count >= MIN_MAJOR_COURSES)
+        self.major_weights = [offered_counts[subject] for subject in self.majors]
+
+    def _simulate_history(self, major: str, quarters: int) -> List[str]:
+        """Take courses quarter by quarter, only once their prerequisites were completed."""
+        pool = set(self.by_subject[major]) | set(self.supporting[major])
+        pool.update(self.rng.sample(self.entry_level, min(BREADTH_COURSES, len(self.entry_level))))
+
+        completed: List[str] = []
+        done = set()
+        for _ in range(quarters):
+            eligible = [course_id for course_id in pool
+                        if course_id not in done and prerequisites_satisfied(self.prerequisites[course_id], done)]
+            if not eligible:
+                break
+            eligible.sort(key=lambda course_id: (
+                course_level(course_id)
+                - (MAJOR_BONUS if self.subject_of[course_id] == major else 0)
+                + self.rng.uniform(0, LEVEL_JITTER),
+                course_id,
+            ))
+            taken = eligible[:self.rng.choice(COURSES_PER_QUARTER)]
+            completed.extend(sorted(taken))
+            done.update(taken)
+
+        return completed
+
+    def _preferences(self, major: str) -> Dict[str, Any]:
+        """Sample time, day and instructor preferences."""
+        instructors = []
+        if self.instructors.get(major) and self.rng.random() < 0.2:
+            instructors = [self.rng.choice(self.instructors[major])]
+        return {
+            'earliest_start': self.rng.choice(EARLIEST_START_CHOICES),
+            'latest_end': self.rng.choice(LATEST_END_CHOICES),
+            'avoid_days': [self.rng.choice(AVOID_DAY_CHOICES)] if self.rng.random() < 0.4 else [],
+            'instructors': instructors,
+        }
+
+    def generate(self, student_number: int = 1) -> Dict[str, Any]:
+        """
+        Generate one student profile.
+
+        Args:
+            student_number: Number used for the student id
+
+        Returns:
+            Student profile dictionary
+        """
+        major = self.rng.choices(self.majors, weights=self.major_weights)[0]
+        quarters = self.rng.randint(0, MAX_QUARTERS)
+        completed = self._simulate_history(major, quarters)
+
+        done = set(completed)
+        upcoming = sorted((course_id for course_id in self.by_subject[major]
+                           if course_id in self.offered and course_id not in done),
+                          key=lambda course_id: (course_level(course_id), course_id))
+
+        return {
+            'student_id': f"S{student_number:05d}",
+            'major': major,
+            'year': min(quarters // 3 + 1, 4),
+            'major_subjects': [major],
+            'completed_courses': completed,
+            'required_courses': upcoming[:REQUIRED_COURSES],
+            'preferences': self._preferences(major),
+        }
+
+    def generate_many(self, count: int) -> List[Dict[str, Any]]:
+        """
+        Generate several student profiles.
+
+        Args:
+            count: Number of students
+
+        Returns:
+            List of student profile dictionaries
+        """
+        return [self.generate(i) for i in range(1, count + 1)]
+
+    def unmet_prerequisites(self, profile: Dict[str, Any]) -> List[str]:
+        """
+        Find completed courses whose prerequisites are not among the completed courses.
+
+        Args:
+            profile: Student profile dictionary
+
+        Returns:
+            Course ids with unmet prerequisites (empty for a consistent profile)
+        """
+        completed = set(profile['completed_courses'])
+        return [course_id for course_id in profile['completed_courses']
+                if not prerequisites_satisfied(self.prerequisites.get(course_id, []), completed - {course_id})]
+
+
+def generate_students(count: int, seed: Optional[int] = None,
+                      subjects_dir: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Generate student profiles from the processed subject files.
+
+    Args:
+        count: Number of students
+        seed: Random seed for reproducible profiles
+        subjects_dir: Directory containing [SUBJECT].json files (defaults to data/processed/subjects)
+
+    Returns:
+        List of student profile dictionaries
+    """
+    return StudentGenerator(load_subjects(subjects_dir), seed).generate_many(count)
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+    from collections import Counter
+
+    parser = argparse.ArgumentParser(description="Generate mock student profiles")
+    parser.add_argument("--count", type=int, default=1000, help="Number of students to generate")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed")
+    parser.add_argument("--output", type=Path, default=None, help="Write the profiles to this JSON file")
+    args = parser.parse_args()
+
+    generator = StudentGenerator(load_subjects(), args.seed)
+    start_time = time.perf_counter()
+    students = generator.generate_many(args.count)
+    elapsed = time.perf_counter() - start_time
+    print(f"Generated {len(students)} students in {elapsed:.2f}s from {len(generator.majors)} majors")
+
+    inconsistent = [student['student_id'] for student in students if generator.unmet_prerequisites(student)]
+    print(f"Students with unmet prerequisites: {len(inconsistent)}")
+
+    majors = Counter(student['major'] for student in students)
+    print(f"Most common majors: {', '.join(f'{major} ({count})' for major, count in majors.most_common(5))}")
+    years = Counter(student['year'] for student in students)
+    print(f"Years: {', '.join(f'{year}: {years[year]}' for year in sorted(years))}")
+    if students:
+        print(json.dumps(students[0], indent=2))
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(students, f, indent=2, ensure_ascii=False)
+        print(f"Saved {len(students)} students to {args.output}")
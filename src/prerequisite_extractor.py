@@ -0,0 +1,215 @@
+"""
+This module extracts prerequisite text from Banner getSectionPrerequisites HTML responses.
+
+A targeted string scanner handles the common response shapes without building a
+parse tree; anything it is not sure about (comments, nested sections, entities, or
+markup inside attribute values) falls back to BeautifulSoup. The differential check
+in __main__ confirms both paths agree on every known response shape.
+"""
+import re
+from typing import Any, Dict, Optional
+
+from bs4 import BeautifulSoup
+
+from prerequisite_parser import parse_prerequisites
+
+
+NO_PREREQUISITES_MARKER = "No prerequisite information available"
+
+# Tag attributes up to the closing ">", which may appear inside quoted attribute values
+TAG_ATTRIBUTES = r'''(?:[^>"']|"[^"]*"|'[^']*')*'''
+
+# Opening tag of <section aria-labelledby="preReqs">; tag and attribute names are
+# case-insensitive like html.parser, the attribute value must match exactly
+SECTION_OPEN_PATTERN = re.compile(
+    r'<(?i:section)(?=[\s>/])' + TAG_ATTRIBUTES + r'?\s(?i:aria-labelledby)\s*=\s*'
+    r'''(?:"preReqs"|'preReqs'|preReqs(?=[\s/>]))''' + TAG_ATTRIBUTES + '>'
+)
+SECTION_TAG_PATTERN = re.compile(r'<(/?)section(?=[\s>/])', re.IGNORECASE)
+# <pre> tags with quoted attributes do not match, so the count check below sends them to the fallback
+PRE_PATTERN = re.compile(r'''<pre(?=[\s>])[^>"']*>(.*?)</pre\s*>''', re.IGNORECASE | re.DOTALL)
+
+# Attribute value containing "<", where a regex could mistake attribute text for a tag
+MARKUP_IN_ATTRIBUTE_PATTERN = re.compile(r'''=\s*(?:"[^"]*<|'[^']*<|[^\s"'>]*<)''')
+
+# Markup the scanner does not interpret; seeing any of it means "use the fallback"
+UNSUPPORTED_MARKUP = ('<!--', '<![cdata[', '<script', '<style')
+
+
+def _scan_prerequisite_text(html: str) -> Optional[str]:
+    """
+    Fast path: locate the prerequisite <pre> tags with regular expressions.
+
+    Args:
+        html: Raw HTML response text
+
+    Returns:
+        Prerequisite text, or None when the response needs the full parser
+    """
+    match = SECTION_OPEN_PATTERN.search(html)
+    if not match:
+        # Only trust "no section" when the document has no markup we could have missed
+        if '<section' in html.lower():
+            return None
+        return ""
+
+    # Find the matching </section>, bailing out on nested sections
+    closing = SECTION_TAG_PATTERN.search(html, match.end())
+    if not closing or not closing.group(1):
+        return None
+    body = html[match.end():closing.start()]
+
+    lowered = html[:closing.end()].lower()
+    if any(markup in lowered for markup in UNSUPPORTED_MARKUP):
+        return None
+    if MARKUP_IN_ATTRIBUTE_PATTERN.search(body):
+        return None
+
+    parts = []
+    for pre in PRE_PATTERN.finditer(body):
+        text = pre.group(1)
+        # Nested tags or entities inside <pre> need real parsing
+        if '<' in text or '&' in text:
+            return None
+        parts.append(text.strip())
+
+    # Unclosed or oddly formed <pre> tags also go to the fallback
+    if len(parts) != body.lower().count('<pre'):
+        return None
+
+    return ''.join(parts).strip()
+
+
+def _soup_prerequisite_text(html: str) -> str:
+    """
+    Fallback: extract prerequisite text with BeautifulSoup.
+
+    Args:
+        html: Raw HTML response text
+
+    Returns:
+        Prerequisite text or empty string if none
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+
+    # Extract prerequisite text from the structured HTML
+    prereq_section = soup.find('section', {'aria-labelledby': 'preReqs'})
+    if not prereq_section:
+        return ""
+
+    # Get all <pre> tags which contain the prerequisite text
+    pre_tags = prereq_section.find_all('pre')
+    if not pre_tags:
+        return ""
+
+    # Combine all prerequisite text
+    prerequisite_text = ''.join(tag.get_text().strip() for tag in pre_tags)
+    return prerequisite_text.strip() if prerequisite_text else ""
+
+
+def extract_prerequisite_text(html: str) -> str:
+    """
+    Extract prerequisite text from a getSectionPrerequisites response.
+
+    Args:
+        html: Raw HTML response text
+
+    Returns:
+        str: Prerequisite text or empty string if none
+    """
+    # Check if no prerequisites
+    if NO_PREREQUISITES_MARKER in html:
+        return ""
+
+    text = _scan_prerequisite_text(html)
+    if text is None:
+        text = _soup_prerequisite_text(html)
+    return text
+
+
+def extract_prerequisites(html: str) -> Dict[str, Any]:
+    """
+    Extract and parse prerequisites from a getSectionPrerequisites response.
+
+    Args:
+        html: Raw HTML response text
+
+    Returns:
+        Dict in the format returned by prerequisite_parser.parse_prerequisites
+    """
+    return parse_prerequisites(extract_prerequisite_text(html))
+
+
+def _build_corpus() -> list:
+    """Build differential test documents from known shapes and processed prerequisite text."""
+    import json
+    from pathlib import Path
+
+    def page(inner: str, attribute: str = 'aria-labelledby="preReqs"') -> str:
+        return (f'<div class="prerequisites"><section {attribute} role="region">'
+                f'<h3 id="preReqs">Prerequisites</h3>{inner}</section></div>')
+
+    corpus = [
+        f'<section aria-labelledby="preReqs"><p>{NO_PREREQUISITES_MARKER}.</p></section>',
+        '',
+        '<div>Unexpected response</div>',
+        page(''),
+        page('<pre></pre>'),
+        page('<pre>\n  Course or Test: Physics 040A \n Minimum Grade of D-\n</pre>'),
+        page('<pre>Part one</pre>\n<pre>  Part two  </pre>'),
+        page('<PRE class=x>Upper case tags</PRE>'),
+        page('<PRE class="x">Quoted attribute</PRE>'),
+        page('<pre title="a>b">Quoted angle bracket</pre>'),
+        page("<pre title='a>b'>Single quoted angle bracket</pre>"),
+        page('<pre>Attribute in section tag</pre>', 'aria-labelledby="preReqs" title="x><pre>y</pre>"'),
+        page('<pre>Attribute before</pre>', 'title="a>b" aria-labelledby="preReqs"'),
+        page('<h4 title="<pre>x</pre>">Markup in attribute</h4>'),
+        page("<h4 title='<pre>x</pre>'>Single quoted markup</h4><pre>y</pre>"),
+        page('<h4 title=<pre>x</pre>>Unquoted markup</h4>'),
+        '<section aria-labelledby="preReqs"><h3 title="<pre>x</pre>">h</h3></section>',
+        page('<pre>Statistics &amp; Probability</pre>'),
+        page('<pre>Course <b>bold</b> text</pre>'),
+        page('<pre>Unclosed pre'),
+        page('<div><pre>Nested pre</pre></div>'),
+        page('<pre>Single quoted</pre>', "aria-labelledby='preReqs'"),
+        page('<pre>Unquoted</pre>', 'aria-labelledby=preReqs'),
+        page('<pre>Wrong value</pre>', 'aria-labelledby="preReqs other"'),
+        page('<pre>Wrong case</pre>', 'aria-labelledby="prereqs"'),
+        page('<section><pre>Nested section</pre></section><pre>Outer</pre>'),
+        '<!-- <section aria-labelledby="preReqs"><pre>Commented</pre></section> -->',
+        '<section aria-labelledby="other"><pre>Other</pre></section>' + page('<pre>Second</pre>'),
+    ]
+
+    subjects_dir = Path(__file__).parent.parent / 'data' / 'processed' / 'subjects'
+    for subject_file in sorted(subjects_dir.glob('*.json')):
+        with open(subject_file, 'r', encoding='utf-8') as f:
+            for course in json.load(f).values():
+                if course['prerequisites']:
+                    corpus.append(page(f"<pre>{course['prerequisites']}</pre>"))
+    return corpus
+
+
+if __name__ == "__main__":
+    import time
+
+    corpus = _build_corpus()
+
+    # Differential check: the fast path must agree with BeautifulSoup on every document
+    fast_hits = 0
+    for html in corpus:
+        expected = "" if NO_PREREQUISITES_MARKER in html else _soup_prerequisite_text(html)
+        assert extract_prerequisite_text(html) == expected, f"Mismatch for document: {html[:120]!r}"
+        if NO_PREREQUISITES_MARKER not in html and _scan_prerequisite_text(html) is not None:
+            fast_hits += 1
+    print(f"Differential check passed for {len(corpus)} documents ({fast_hits} handled by the fast path)")
+
+    # Benchmark both paths over the whole corpus
+    rounds = 5
+    for name, extract in (("BeautifulSoup", _soup_prerequisite_text), ("Fast path", extract_prerequisite_text)):
+        start_time = time.perf_counter()
+        for _ in range(rounds):
+            for html in corpus:
+                extract(html)
+        elapsed = time.perf_counter() - start_time
+        per_document = elapsed / (rounds * len(corpus))
+        print(f"{name}: {per_document * 1e6:.1f} microseconds per document")
@@ -1,30 +1,98 @@
 """
 This module contains functions to parse prerequisite information from UCR course data.
 """
+import copy
 import re
-from typing import Dict, List, Any
+from functools import lru_cache
+from typing import Dict, List, Any, Iterable
 
 
-def parse_prerequisites(prerequisite_text: str) -> Dict[str, Any]:
-    """
-    Parse prerequisite text into structured data.
-    
-    Args:
-        prerequisite_text: Raw prerequisite text from UCR system
-    
-    Returns:
-        Dict containing parsed prerequisite information:
-        - raw_text: Original prerequisite text
-        - courses: List of required courses with details
-        - has_prerequisites: Boolean indicating if prerequisites exist
-        - logic: Description of prerequisite logic (AND/OR relationships)
-    """
+# Maximum number of distinct prerequisite texts kept by the parse cache
+PARSE_CACHE_SIZE = 4096
+
+# Pattern to match course requirements like "Computer Science 010C"
+# or "Mathematics 009C" with minimum grade
+COURSE_PATTERN = re.compile(r'Course or Test:\s*([A-Za-z ]+)\s*([0-9A-Z]+)\s*\n\s*Minimum Grade of ([A-Z][+-]?)')
+CONNECTOR_PATTERN = re.compile(r'\b(and|or)\b', re.IGNORECASE)
+AND_PATTERN = re.compile(r' and |\nand\n', re.IGNORECASE)
+OR_PATTERN = re.compile(r' or |\nor\n', re.IGNORECASE)
+
+# Subject names used in prerequisite text mapped to UCR subject codes
+SUBJECT_MAPPINGS = {
+    "Anthropology": "ANTH",
+    "Arabic Language": "ARBC",
+    "Art": "ART",
+    "Basic Writing": "BSWT",
+    "Biochemistry": "BCH",
+    "Bioengineering": "BIEN",
+    "Biology": "BIOL",
+    "Biomedical Sciences": "BMSC",
+    "Business": "BUS",
+    "Cahuilla": "CAH",
+    "Cell Biology and Neuroscience": "CBNS",
+    "Chemical Engineering": "CHE",
+    "Chemical and Environmental Eng": "CEE",
+    "Chemistry": "CHEM",
+    "Chinese": "CHN",
+    "Comparative Literature": "CPLT",
+    "Computer Science": "CS",
+    "Creative Writing": "CRWT",
+    "Dance": "DNCE",
+    "Economics": "ECON",
+    "Education": "EDUC",
+    "Electrical Engineering": "EE",
+    "Engineering": "ENGR",
+    "English": "ENGL",
+    "Entomology": "ENTM",
+    "Environmental Engineering": "ENVE",
+    "Environmental Sciences": "ENSC",
+    "Ethnic Studies": "ETST",
+    "Filipino": "FIL",
+    "French": "FREN",
+    "Gender and Sexuality Studies": "GSST",
+    "Geosciences": "GEO",
+    "German": "GER",
+    "Global Studies": "GBST",
+    "Greek": "GRK",
+    "History": "HIST",
+    "Honors": "HNPG",
+    "Italian": "ITAL",
+    "Japanese": "JPN",
+    "Korean": "KOR",
+    "Latin": "LATN",
+    "Linguistics": "LING",
+    "Management": "MGT",
+    "Materials Sci and Engineering": "MSE",
+    "Mathematics": "MATH",
+    "Mechanical Engineering": "ME",
+    "Media and Cultural Studies": "MCS",
+    "Microbiology": "MCBL",
+    "Music": "MUS",
+    "Philosophy": "PHIL",
+    "Physics": "PHYS",
+    "Plant Pathology": "PLPA",
+    "Political Science": "POSC",
+    "Psychology": "PSYC",
+    "Religious Studies": "RLST",
+    "Russian Studies": "RUSN",
+    "Sociology": "SOC",
+    "Spanish": "SPN",
+    "Statistics": "STAT",
+    "Urban Studies": "URST",
+    "Vietnamese": "VNM",
+}
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_prerequisites_cached(prerequisite_text: str) -> Dict[str, Any]:
+    """Parse prerequisite text; the cached result is private and never handed out."""
     if not prerequisite_text or prerequisite_text.strip() == "":
         return {
             "raw_text": "",
             "courses": [],
             "has_prerequisites": False,
-            "logic": None
+            "logic": None,
+            "groups": []
         }
     
     # Extract course requirements
@@ -37,10 +105,33 @@ def parse_prerequisites(prerequisite_text: str) -> Dict[str, Any]:
         "raw_text": prerequisite_text,
         "courses": courses,
         "has_prerequisites": len(courses) > 0,
-        "logic": logic
+        "logic": logic,
+        "groups": get_prerequisite_groups(prerequisite_text)
     }
 
 
+def parse_prerequisites(prerequisite_text: str) -> Dict[str, Any]:
+    """
+    Parse prerequisite text into structured data.
+    
+    Parses are cached by text, so identical prerequisite strings repeated across
+    sections, courses and terms are parsed once. Every call returns its own copy,
+    so callers may modify the result without affecting the cache or each other.
+    
+    Args:
+        prerequisite_text: Raw prerequisite text from UCR system
+    
+    Returns:
+        Dict containing parsed prerequisite information:
+        - raw_text: Original prerequisite text
+        - courses: List of required courses with details
+        - has_prerequisites: Boolean indicating if prerequisites exist
+        - logic: Description of prerequisite logic (AND/OR relationships)
+        - groups: Required groups of alternative course ids (see get_prerequisite_groups)
+    """
+    return copy.deepcopy(_parse_prerequisites_cached(prerequisite_text))
+
+
 def extract_course_requirements(text: str) -> List[Dict[str, Any]]:
     """
     Extract individual course requirements from prerequisite text.
@@ -53,11 +144,7 @@ def extract_course_requirements(text: str) -> List[Dict[str, Any]]:
     """
     courses = []
     
-    # Pattern to match course requirements like "Computer Science 010C"
-    # or "Mathematics 009C" with minimum grade
-    course_pattern = r'Course or Test:\s*([A-Za-z ]+)\s*([0-9A-Z]+)\s*\n\s*Minimum Grade of ([A-Z][+-]?)'
-    
-    matches = re.findall(course_pattern, text)
+    matches = COURSE_PATTERN.findall(text)
     
     for match in matches:
         subject_name, course_number, min_grade = match
@@ -89,21 +176,7 @@ def extract_subject_code(subject_name: str) -> str:
     Returns:
         Subject code (e.g., "CS")
     """
-    # Common subject mappings
-    subject_mappings = {
-        "Computer Science": "CS",
-        "Mathematics": "MATH",
-        "Physics": "PHYS",
-        "Chemistry": "CHEM",
-        "Biology": "BIOL",
-        "Statistics": "STAT",
-        "English": "ENGL",
-        "Engineering": "ENGR",
-        "Business": "BUS",
-        "Economics": "ECON"
-    }
-    
-    return subject_mappings.get(subject_name, subject_name.upper().replace(" ", ""))
+    return SUBJECT_MAPPINGS.get(subject_name, subject_name.upper().replace(" ", ""))
 
 
 def determine_prerequisite_logic(text: str) -> str:
@@ -116,10 +189,8 @@ def determine_prerequisite_logic(text: str) -> str:
     Returns:
         String describing the logic (e.g., "AND", "OR", "COMPLEX")
     """
-    text_lower = text.lower()
-    
-    has_and = " and " in text_lower or "\nand\n" in text_lower
-    has_or = " or " in text_lower or "\nor\n" in text_lower
+    has_and = AND_PATTERN.search(text) is not None
+    has_or = OR_PATTERN.search(text) is not None
     
     if has_and and has_or:
         return "COMPLEX"
@@ -131,6 +202,55 @@ def determine_prerequisite_logic(text: str) -> str:
         return "SINGLE"
 
 
+def get_prerequisite_groups(prerequisite_text: str) -> List[List[str]]:
+    """
+    Convert prerequisite text into required groups of alternative course ids.
+    
+    The requirements are read left to right with "or" binding tighter than "and",
+    since UCR lists honors and lab equivalents as "or" alternatives of the course
+    just before them: "A and B or C" becomes [["A"], ["B", "C"]] (A and (B or C)).
+    The prerequisites are satisfied when every group has at least one completed course.
+    
+    Args:
+        prerequisite_text: Raw prerequisite text from UCR system
+    
+    Returns:
+        List of groups, each a list of alternative course ids (e.g., "CS010C"); empty if none
+    """
+    groups = []
+    previous_end = None
+    
+    for match in COURSE_PATTERN.finditer(prerequisite_text or ""):
+        subject_name, course_number, _ = match.groups()
+        course_id = f"{extract_subject_code(subject_name.strip())}{course_number.strip()}"
+        
+        # The last connector between two requirements decides how they combine
+        connectors = CONNECTOR_PATTERN.findall(prerequisite_text[previous_end:match.start()]) if previous_end else []
+        if groups and connectors and connectors[-1].lower() == "or":
+            groups[-1].append(course_id)
+        else:
+            groups.append([course_id])
+        
+        previous_end = match.end()
+    
+    return groups
+
+
+def prerequisites_satisfied(prerequisite_groups: List[List[str]], completed_courses: Iterable[str]) -> bool:
+    """
+    Check whether completed courses satisfy prerequisite groups.
+    
+    Args:
+        prerequisite_groups: Output from get_prerequisite_groups()
+        completed_courses: Completed course ids (e.g., ["CS010A", "MATH009A"])
+    
+    Returns:
+        True if every group has at least one completed course (or there are no prerequisites)
+    """
+    completed = completed_courses if isinstance(completed_courses, (set, frozenset)) else set(completed_courses)
+    return all(any(course_id in completed for course_id in group) for group in prerequisite_groups)
+
+
 def get_prerequisite_summary(parsed_prerequisites: Dict[str, Any]) -> str:
     """
     Generate a human-readable summary of prerequisites.
@@ -193,4 +313,5 @@ or
     print(f"Courses: {len(parsed['courses'])}")
     for course in parsed['courses']:
         print(f"  - {course}")
-    print(f"Summary: {get_prerequisite_summary(parsed)}")
\ No newline at end of file
+    print(f"Summary: {get_prerequisite_summary(parsed)}")
+    print(f"Groups: {get_prerequisite_groups(sample_text)}")
\ No newline at end of file
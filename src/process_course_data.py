@@ -7,12 +7,27 @@ for the UCR Course Scheduling Chatbot.
 
 Input: data/raw/course_catalog.json (raw Banner API data)
 Output: data/processed/subjects/[SUBJECT].json (cleaned, organized by subject)
+        data/processed/room_index.json (physical room occupancy intervals)
+
+Usage:
+    python src/process_course_data.py [--workers N]
 """
 
+import argparse
 import json
+import os
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+from prerequisite_parser import parse_prerequisites
+from room_index import RoomIndex
+
+
+# Parsed prerequisite fields written to the subject files; raw_text would repeat the
+# "prerequisites" field and has_prerequisites is just whether courses is non-empty
+PERSISTED_PREREQUISITE_FIELDS = ('courses', 'logic', 'groups')
+
 
 def clean_course_data(course):
     """
@@ -99,11 +114,14 @@ def clean_course_data(course):
                 'room': meeting_time.get('room')
             }
     
+    parsed = parse_prerequisites(prerequisites)
+    
     return {
         'course_id': course_id,
         'title': title,
         'credits': credits,
         'prerequisites': prerequisites,
+        'prerequisites_parsed': {field: parsed[field] for field in PERSISTED_PREREQUISITE_FIELDS},
         'section': section_info
     }
 
@@ -122,6 +140,7 @@ def group_courses_by_subject(raw_data):
         'title': '',
         'credits': '',
         'prerequisites': '',
+        'prerequisites_parsed': None,
         'sections': []
     }))
     
@@ -141,6 +160,7 @@ def group_courses_by_subject(raw_data):
         course_entry['title'] = cleaned['title']
         course_entry['credits'] = cleaned['credits']
         course_entry['prerequisites'] = cleaned['prerequisites']
+        course_entry['prerequisites_parsed'] = cleaned['prerequisites_parsed']
         
         # Add section info
         course_entry['sections'].append(cleaned['section'])
@@ -148,6 +168,102 @@ def group_courses_by_subject(raw_data):
     return subjects
 
 
+def shard_by_subject(raw_data, num_shards):
+    """
+    Split raw course data into shards that each hold whole subjects.
+    
+    Subjects keep their first-appearance order and records keep their original
+    order within a subject, so grouping the shards reproduces the serial result.
+    
+    Args:
+        raw_data (list): List of raw course data
+        num_shards (int): Maximum number of shards to create
+        
+    Returns:
+        list: List of shards, each a list of raw course records
+    """
+    records_by_subject = defaultdict(list)
+    for course in raw_data:
+        subject = course.get('subject', '')
+        if subject:
+            records_by_subject[subject].append(course)
+    
+    # Greedily assign subjects (largest first) to the currently smallest shard
+    shards = [[] for _ in range(max(1, min(num_shards, len(records_by_subject))))]
+    sizes = [0] * len(shards)
+    for subject in sorted(records_by_subject, key=lambda s: len(records_by_subject[s]), reverse=True):
+        smallest = sizes.index(min(sizes))
+        shards[smallest].append(subject)
+        sizes[smallest] += len(records_by_subject[subject])
+    
+    return [[course for subject in shard for course in records_by_subject[subject]] for shard in shards]
+
+
+def _group_shard(shard):
+    """Group one shard in a worker process, returning plain (picklable) dictionaries."""
+    return {subject: dict(courses) for subject, courses in group_courses_by_subject(shard).items()}
+
+
+def group_courses_by_subject_parallel(raw_data, workers):
+    """
+    Group courses by subject using a process pool.
+    
+    Produces the same subjects, courses and sections, in the same order, as
+    group_courses_by_subject.
+    
+    Args:
+        raw_data (list): List of raw course data
+        workers (int): Number of worker processes
+        
+    Returns:
+        dict: Dictionary of subjects with organized course data
+    """
+    shards = shard_by_subject(raw_data, workers * 4)
+    
+    shard_results = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for shard_subjects in executor.map(_group_shard, shards):
+            shard_results.update(shard_subjects)
+    
+    # Merge in first-appearance order, matching the serial path
+    subjects = {}
+    for course in raw_data:
+        subject = course.get('subject', '')
+        if subject in shard_results and subject not in subjects:
+            subjects[subject] = shard_results[subject]
+    
+    return subjects
+
+
+def _write_subject_file(subject_file, courses):
+    """Write one subject file."""
+    with open(subject_file, 'w', encoding='utf-8') as f:
+        json.dump(dict(courses), f, indent=2, ensure_ascii=False)
+
+
+def write_subject_files(subjects, output_dir, workers=1):
+    """
+    Write one JSON file per subject.
+    
+    Args:
+        subjects (dict): Dictionary of subjects with course data
+        output_dir (Path): Directory for [SUBJECT].json files
+        workers (int): Number of worker processes (1 writes serially)
+    """
+    subject_files = [output_dir / f"{subject}.json" for subject in subjects]
+    
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(_write_subject_file, subject_files,
+                              [dict(courses) for courses in subjects.values()]))
+    else:
+        for subject_file, courses in zip(subject_files, subjects.values()):
+            _write_subject_file(subject_file, courses)
+    
+    for (subject, courses), subject_file in zip(subjects.items(), subject_files):
+        print(f"  {subject}: {len(courses)} courses -> {subject_file.name}")
+
+
 def create_subjects_index(subjects):
     """
     Create an index of all subjects with metadata.
@@ -173,12 +289,19 @@ def create_subjects_index(subjects):
     return index
 
 
-def main():
-    """Main processing function."""
+def main(raw_file=None, output_dir=None, workers=1):
+    """
+    Main processing function.
+    
+    Args:
+        raw_file (Path): Raw catalog JSON (defaults to data/raw/course_catalog.json)
+        output_dir (Path): Subject file directory (defaults to data/processed/subjects)
+        workers (int): Number of worker processes (1 processes serially)
+    """
     # Setup paths
     base_dir = Path(__file__).parent.parent
-    raw_file = base_dir / 'data' / 'raw' / 'course_catalog.json'
-    output_dir = base_dir / 'data' / 'processed' / 'subjects'
+    raw_file = Path(raw_file) if raw_file else base_dir / 'data' / 'raw' / 'course_catalog.json'
+    output_dir = Path(output_dir) if output_dir else base_dir / 'data' / 'processed' / 'subjects'
     
     # Create output directory
     output_dir.mkdir(parents=True, exist_ok=True)
@@ -194,21 +317,18 @@ def main():
         print(f"Error: Invalid JSON in {raw_file}")
         return
     
-    print(f"Processing {len(raw_data)} courses...")
-    
     # Group courses by subject
-    subjects = group_courses_by_subject(raw_data)
+    if workers > 1:
+        print(f"Processing {len(raw_data)} courses with {workers} workers...")
+        subjects = group_courses_by_subject_parallel(raw_data, workers)
+    else:
+        print(f"Processing {len(raw_data)} courses...")
+        subjects = group_courses_by_subject(raw_data)
     
     print(f"Found {len(subjects)} subjects")
     
     # Write subject files
-    for subject, courses in subjects.items():
-        subject_file = output_dir / f"{subject}.json"
-        
-        with open(subject_file, 'w', encoding='utf-8') as f:
-            json.dump(dict(courses), f, indent=2, ensure_ascii=False)
-        
-        print(f"  {subject}: {len(courses)} courses -> {subject_file.name}")
+    write_subject_files(subjects, output_dir, workers)
     
     # Create subjects index
     print("Creating subjects index...")
@@ -219,6 +339,14 @@ def main():
         json.dump(index, f, indent=2, ensure_ascii=False)
     
     print(f"Subjects index saved to {index_file}")
+    
+    # Create room occupancy index
+    print("Creating room index...")
+    room_index = RoomIndex.from_subjects(subjects)
+    room_index_file = output_dir.parent / 'room_index.json'
+    room_index.save(room_index_file)
+    
+    print(f"Room index saved to {room_index_file} ({len(room_index.room_names)} rooms)")
     print("Processing complete!")
     
     # Print summary
@@ -235,4 +363,11 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Process the raw course catalog into subject files")
+    parser.add_argument("--raw-file", type=Path, help="Raw catalog JSON (default: data/raw/course_catalog.json)")
+    parser.add_argument("--output-dir", type=Path, help="Subject file directory (default: data/processed/subjects)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes for cleaning and writing (0 = one per CPU, default: 1)")
+    args = parser.parse_args()
+    
+    main(args.raw_file, args.output_dir, args.workers or os.cpu_count())
\ No newline at end of file
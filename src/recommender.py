@@ -0,0 +1,285 @@
+"""
+This module contains a vectorized course recommendation scorer over the processed catalog.
+
+Every section gets a feature vector (eligibility, requirement match, seat availability,
+time preference fit, preferred instructor). Scores for a whole batch of students are
+computed in one NumPy pass by weighting the feature tensor, then reduced to the best
+section per course and trimmed to the top k courses without sorting the full catalog.
+
+Student profiles are plain dictionaries:
+    {
+        "completed_courses": ["CS010A", "MATH009A"],
+        "required_courses": ["CS010B", "CS011"],
+        "major_subjects": ["CS"],
+        "preferences": {"earliest_start": "1000", "latest_end": "1800",
+                        "avoid_days": ["F"], "instructors": []},
+        "weights": {"seats": 2.0}           # optional overrides of DEFAULT_WEIGHTS
+    }
+"""
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from prerequisite_parser import parse_prerequisites
+from section_table import NO_TIME, SectionTable, days_to_mask, hhmm_to_minutes, load_subjects
+
+
+FEATURES = ('eligibility', 'requirement', 'seats', 'time_fit', 'instructor')
+
+# Ordered by the README's priority: eligibility, then major requirements, then availability
+DEFAULT_WEIGHTS = {'eligibility': 4.0, 'requirement': 2.0, 'seats': 1.0, 'time_fit': 1.0, 'instructor': 0.5}
+
+# Requirement feature for a course in one of the student's major subjects but not on their list
+MAJOR_SUBJECT_MATCH = 0.5
+
+# Time fit feature for sections without a scheduled meeting time (e.g., online or research)
+UNSCHEDULED_TIME_FIT = 0.5
+
+
+class CourseRecommender:
+    def __init__(self, subjects: Dict[str, Dict[str, Any]]):
+        """
+        Precompute per-course and per-section data for scoring.
+
+        Args:
+            subjects: Processed subject data (subject -> course_id -> course entry)
+        """
+        self.table = SectionTable.from_subjects(subjects)
+        course_codes = self.table['course_id']
+
+        # Sections of a course are contiguous in the table, so courses are runs of rows
+        self.course_starts = np.flatnonzero(np.r_[True, course_codes[1:] != course_codes[:-1]])
+        self.section_course = np.repeat(np.arange(len(self.course_starts)),
+                                        np.diff(np.r_[self.course_starts, len(self.table)]))
+        self.course_ids = self.table.categories['course_id'][course_codes[self.course_starts]]
+        self.course_index = {course_id: i for i, course_id in enumerate(self.course_ids)}
+
+        course_subjects = self.table.labels('subject')[self.course_starts]
+        entries = [subjects[subject][course_id] for subject, course_id in zip(course_subjects, self.course_ids)]
+        self.titles = [entry['title'] for entry in entries]
+        # Prefer the parse stored by process_course_data; older files fall back to the (cached) parser
+        self._index_prerequisites([
+            (entry.get('prerequisites_parsed') or parse_prerequisites(entry['prerequisites']))['groups']
+            for entry in entries
+        ])
+
+        # Static section feature: share of seats still open
+        capacity = self.table['capacity']
+        seats = np.divide(self.table['available'], capacity,
+                          out=np.zeros(len(self.table), dtype=np.float64), where=capacity > 0)
+        self.seat_ratio = np.clip(seats, 0.0, 1.0).astype(np.float32)
+
+    def _index_prerequisites(self, prerequisite_groups: List[List[List[str]]]) -> None:
+        """
+        Flatten prerequisite groups into arrays so eligibility is a few bincounts.
+
+        Args:
+            prerequisite_groups: Prerequisite groups (see get_prerequisite_groups) for every course
+        """
+        self.prerequisite_vocabulary = {}
+        group_course, member_group, member_course = [], [], []
+
+        for course, groups in enumerate(prerequisite_groups):
+            for group in groups:
+                for course_id in group:
+                    member_group.append(len(group_course))
+                    vocabulary_index = self.prerequisite_vocabulary.setdefault(course_id, len(self.prerequisite_vocabulary))
+                    member_course.append(vocabulary_index)
+                group_course.append(course)
+
+        self.group_course = np.array(group_course, dtype=np.int64)
+        self.member_group = np.array(member_group, dtype=np.int64)
+        self.member_course = np.array(member_course, dtype=np.int64)
+        self.course_group_count = np.bincount(self.group_course, minlength=len(self.course_ids))
+
+    def course_eligibility(self, completed_courses: List[str]) -> np.ndarray:
+        """
+        Check prerequisites for every course.
+
+        A course is eligible if every one of its prerequisite groups has at least one
+        completed course (courses without prerequisites have no groups).
+
+        Args:
+            completed_courses: Completed course ids
+
+        Returns:
+            Boolean array with one entry per course
+        """
+        completed = np.zeros(len(self.prerequisite_vocabulary), dtype=bool)
+        completed[[self.prerequisite_vocabulary[course_id] for course_id in completed_courses
+                   if course_id in self.prerequisite_vocabulary]] = True
+
+        completed_members = np.bincount(self.member_group, weights=completed[self.member_course],
+                                         minlength=len(self.group_course))
+        satisfied_groups = np.bincount(self.group_course, weights=completed_members > 0,
+                                       minlength=len(self.course_ids))
+        return satisfied_groups == self.course_group_count
+
+    def _course_mask(self, course_ids: List[str]) -> np.ndarray:
+        """Boolean per-course mask for the given course ids (unknown ids are ignored)."""
+        mask = np.zeros(len(self.course_ids), dtype=bool)
+        mask[[self.course_index[course_id] for course_id in course_ids if course_id in self.course_index]] = True
+        return mask
+
+    def _time_fit(self, preferences: Dict[str, Any]) -> np.ndarray:
+        """Per-section time preference fit: 1 fits, 0 conflicts, UNSCHEDULED_TIME_FIT if no meeting time."""
+        start = self.table['start_minutes']
+        end = self.table['end_minutes']
+        fits = np.ones(len(self.table), dtype=bool)
+
+        if preferences.get('earliest_start') is not None:
+            fits &= start >= hhmm_to_minutes(preferences['earliest_start'])
+        if preferences.get('latest_end') is not None:
+            fits &= end <= hhmm_to_minutes(preferences['latest_end'])
+        avoided = days_to_mask(preferences.get('avoid_days', ()))
+        if avoided:
+            fits &= (self.table['day_mask'] & avoided) == 0
+
+        return np.where(start == NO_TIME, UNSCHEDULED_TIME_FIT, fits).astype(np.float32)
+
+    def features(self, profile: Dict[str, Any]) -> np.ndarray:
+        """
+        Compute the feature matrix for one student.
+
+        Args:
+            profile: Student profile dictionary
+
+        Returns:
+            Float array of shape (sections, len(FEATURES))
+        """
+        preferences = profile.get('preferences', {})
+        eligible = self.course_eligibility(profile.get('completed_courses', []))
+
+        requirement = np.where(self.table.isin('subject', profile.get('major_subjects', [])),
+                               MAJOR_SUBJECT_MATCH, 0.0)
+        required = self._course_mask(profile.get('required_courses', []))[self.section_course]
+        requirement = np.where(required, 1.0, requirement)
+
+        return np.stack([
+            eligible[self.section_course],
+            requirement,
+            self.seat_ratio,
+            self._time_fit(preferences),
+            self.table.isin('instructor', preferences.get('instructors', [])),
+        ], axis=1).astype(np.float32)
+
+    def score(self, profiles: List[Dict[str, Any]]) -> np.ndarray:
+        """
+        Score every section for a batch of students.
+
+        Completed courses, and courses whose prerequisites are unmet unless the profile
+        sets "eligible_only" to False, score -inf.
+
+        Args:
+            profiles: Student profile dictionaries
+
+        Returns:
+            Float array of shape (students, sections)
+        """
+        feature_tensor = np.stack([self.features(profile) for profile in profiles])
+        weights = np.array([[{**DEFAULT_WEIGHTS, **profile.get('weights', {})}[name] for name in FEATURES]
+                            for profile in profiles], dtype=np.float32)
+        scores = np.einsum('snf,sf->sn', feature_tensor, weights)
+
+        for row, profile in enumerate(profiles):
+            excluded = self._course_mask(profile.get('completed_courses', []))[self.section_course]
+            if profile.get('eligible_only', True):
+                excluded |= feature_tensor[row, :, 0] == 0
+            scores[row, excluded] = -np.inf
+
+        return scores
+
+    def recommend_batch(self, profiles: List[Dict[str, Any]], k: int = 10,
+                        batch_size: int = 64) -> List[List[Dict[str, Any]]]:
+        """
+        Recommend the top k courses, with their best section, for each student.
+
+        Args:
+            profiles: Student profile dictionaries
+            k: Number of courses to return per student
+            batch_size: Students scored per NumPy pass (bounds feature tensor memory)
+
+        Returns:
+            One list of recommendation dictionaries per profile, best first
+        """
+        k = min(k, len(self.course_ids))
+        crns = self.table['crn']
+        recommendations = []
+
+        for batch_start in range(0, len(profiles), batch_size):
+            batch = profiles[batch_start:batch_start + batch_size]
+            scores = self.score(batch)
+            course_scores = np.maximum.reduceat(scores, self.course_starts, axis=1)
+
+            # Partial selection of the k best courses, then order only those k
+            top = np.argpartition(-course_scores, k - 1, axis=1)[:, :k]
+            for row, candidates in enumerate(top):
+                candidate_scores = course_scores[row, candidates]
+                ordered = candidates[np.lexsort((candidates, -candidate_scores))]
+
+                results = []
+                for course in ordered:
+                    if not np.isfinite(course_scores[row, course]):
+                        break
+                    start = self.course_starts[course]
+                    end = self.course_starts[course + 1] if course + 1 < len(self.course_starts) else len(self.table)
+                    section = start + int(np.argmax(scores[row, start:end]))
+                    results.append({
+                        'course_id': self.course_ids[course],
+                        'title': self.titles[course],
+                        'score': float(course_scores[row, course]),
+                        'crn': str(crns[section]),
+                    })
+                recommendations.append(results)
+
+        return recommendations
+
+    def recommend(self, profile: Dict[str, Any], k: int = 10) -> List[Dict[str, Any]]:
+        """
+        Recommend the top k courses for one student.
+
+        Args:
+            profile: Student profile dictionary
+            k: Number of courses to return
+
+        Returns:
+            List of recommendation dictionaries, best first
+        """
+        return self.recommend_batch([profile], k)[0]
+
+
+def load_recommender(subjects_dir: Optional[str] = None) -> CourseRecommender:
+    """
+    Build a recommender over the processed subject files.
+
+    Args:
+        subjects_dir: Directory containing [SUBJECT].json files (defaults to data/processed/subjects)
+
+    Returns:
+        CourseRecommender over the full catalog
+    """
+    return CourseRecommender(load_subjects(subjects_dir))
+
+
+if __name__ == "__main__":
+    import time
+
+    recommender = load_recommender()
+    print(f"Loaded {len(recommender.course_ids)} courses, {len(recommender.table)} sections")
+
+    sample_profile = {
+        "completed_courses": ["CS010A", "CS010B", "MATH009A", "MATH009B", "MATH009C"],
+        "required_courses": ["CS010C", "CS011", "CS061", "MATH010A"],
+        "major_subjects": ["CS"],
+        "preferences": {"earliest_start": "1000", "avoid_days": ["F"]},
+    }
+    for recommendation in recommender.recommend(sample_profile, k=5):
+        print(f"  {recommendation['course_id']} {recommendation['title']} "
+              f"(CRN {recommendation['crn']}, score {recommendation['score']:.2f})")
+
+    students = 1000
+    profiles = [sample_profile] * students
+    start_time = time.perf_counter()
+    recommender.recommend_batch(profiles, k=10)
+    elapsed = time.perf_counter() - start_time
+    print(f"Scored {students} students in {elapsed:.2f}s ({students / elapsed:.0f} students/sec)")
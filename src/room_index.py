@@ -0,0 +1,283 @@
+"""
+This module indexes physical room occupancy from the processed course data.
+
+Every in-person section with a building, meeting days and a meeting time becomes one
+interval per meeting day. For each room and each building, the intervals on a day are
+swept into a timeline of elementary segments (sorted boundaries plus the sections
+active between them), so point queries are a binary search and load queries read
+precomputed segment counts. Online, off-campus, TBA and unscheduled sections are left out.
+"""
+import json
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from section_table import DAY_BITS, hhmm_to_minutes
+
+
+# Building codes that are not physical campus locations (online, to be announced, off campus)
+VIRTUAL_BUILDINGS = {'ONLINE', 'TBA', 'OFFCM'}
+
+# Room names that mean the room is not known yet
+PLACEHOLDER_ROOMS = {'TBA'}
+
+# Physical spaces that are indexed for building load but are not classrooms (greenhouses)
+NON_CLASSROOM_BUILDINGS = {'HOUSE'}
+
+ROOM_INDEX_FILE = Path(__file__).parent.parent / 'data' / 'processed' / 'room_index.json'
+
+Time = Union[str, int]
+
+
+def extract_room_intervals(subjects: Dict[str, Dict[str, Any]]) -> List[List[Any]]:
+    """
+    Extract meeting intervals for every physical section.
+
+    Args:
+        subjects: Processed subject data (subject -> course_id -> course entry)
+
+    Returns:
+        List of [building, room, days, start_minutes, end_minutes, crn, course_id]
+        entries, where days is a string of day abbreviations (e.g., "MWF") and
+        room is None when only the building is known
+    """
+    intervals = []
+    for courses in subjects.values():
+        for course_id, course in courses.items():
+            for section in course['sections']:
+                schedule = section['schedule']
+                building = schedule['building']
+                if not building or building in VIRTUAL_BUILDINGS:
+                    continue
+                if not schedule['days'] or not schedule['startTime'] or not schedule['endTime']:
+                    continue
+                room = schedule['room']
+                intervals.append([
+                    building,
+                    room if room not in PLACEHOLDER_ROOMS else None,
+                    ''.join(schedule['days']),
+                    hhmm_to_minutes(schedule['startTime']),
+                    hhmm_to_minutes(schedule['endTime']),
+                    section['crn'],
+                    course_id,
+                ])
+    return intervals
+
+
+class Timeline:
+    """Occupancy of one room or building on one day as sorted elementary segments."""
+
+    def __init__(self, intervals: Iterable[Tuple[int, int, str]]):
+        """
+        Sweep intervals into segments.
+
+        Args:
+            intervals: (start_minutes, end_minutes, crn) tuples; intervals are half-open
+        """
+        events = defaultdict(list)
+        for start, end, crn in intervals:
+            if end > start:
+                events[start].append((1, crn))
+                events[end].append((-1, crn))
+
+        self.boundaries: List[int] = sorted(events)
+        self.active: List[Tuple[str, ...]] = []
+        current = defaultdict(int)
+        for boundary in self.boundaries:
+            for delta, crn in events[boundary]:
+                current[crn] += delta
+                if not current[crn]:
+                    del current[crn]
+            self.active.append(tuple(sorted(current)))
+
+        # Precomputed load per segment for building-load queries
+        self.counts: List[int] = [len(active) for active in self.active]
+
+    def at(self, minute: int) -> Tuple[str, ...]:
+        """CRNs active at a minute after midnight."""
+        i = bisect_right(self.boundaries, minute) - 1
+        return self.active[i] if i >= 0 else ()
+
+    def overlapping(self, start: int, end: int) -> Tuple[str, ...]:
+        """CRNs active anywhere in the half-open window [start, end)."""
+        first = max(bisect_right(self.boundaries, start) - 1, 0)
+        last = bisect_left(self.boundaries, end)
+        crns = set()
+        for active in self.active[first:last]:
+            crns.update(active)
+        return tuple(sorted(crns))
+
+    def is_free(self, start: int, end: int) -> bool:
+        """Whether nothing is active anywhere in [start, end)."""
+        first = max(bisect_right(self.boundaries, start) - 1, 0)
+        last = bisect_left(self.boundaries, end)
+        return not any(self.counts[first:last])
+
+    def segments(self) -> List[Tuple[int, int, int]]:
+        """Non-empty (start_minutes, end_minutes, count) segments in time order."""
+        return [(self.boundaries[i], self.boundaries[i + 1], self.counts[i])
+                for i in range(len(self.boundaries) - 1) if self.counts[i]]
+
+
+class RoomIndex:
+    def __init__(self, intervals: List[List[Any]]):
+        """
+        Build per-room and per-building timelines for every day.
+
+        Args:
+            intervals: Output of extract_room_intervals()
+        """
+        self.intervals = intervals
+        self.sections: Dict[str, Dict[str, Any]] = {}
+
+        by_room = defaultdict(list)
+        by_building = defaultdict(list)
+        for building, room, days, start, end, crn, course_id in intervals:
+            self.sections[crn] = {'course_id': course_id, 'building': building, 'room': room,
+                                  'days': days, 'start': start, 'end': end}
+            for day in days:
+                if room:
+                    by_room[(building, room, day)].append((start, end, crn))
+                by_building[(building, day)].append((start, end, crn))
+
+        self.rooms: Dict[Tuple[str, str, str], Timeline] = {key: Timeline(value) for key, value in by_room.items()}
+        self.buildings: Dict[Tuple[str, str], Timeline] = {key: Timeline(value) for key, value in by_building.items()}
+        self.room_names = sorted({(building, room) for building, room, _ in self.rooms})
+
+    @classmethod
+    def from_subjects(cls, subjects: Dict[str, Dict[str, Any]]) -> 'RoomIndex':
+        """Build the index from processed subject data."""
+        return cls(extract_room_intervals(subjects))
+
+    @classmethod
+    def load(cls, index_file: Optional[Path] = None) -> 'RoomIndex':
+        """
+        Load an index saved by RoomIndex.save().
+
+        Args:
+            index_file: Path to room_index.json (defaults to data/processed/room_index.json)
+        """
+        with open(index_file or ROOM_INDEX_FILE, 'r', encoding='utf-8') as f:
+            return cls(json.load(f)['intervals'])
+
+    def save(self, index_file: Optional[Path] = None) -> None:
+        """
+        Save the index intervals as JSON.
+
+        Args:
+            index_file: Output path (defaults to data/processed/room_index.json)
+        """
+        with open(index_file or ROOM_INDEX_FILE, 'w', encoding='utf-8') as f:
+            json.dump({'intervals': self.intervals}, f, ensure_ascii=False)
+
+    def free_rooms(self, day: str, start: Time, end: Optional[Time] = None,
+                   building: Optional[str] = None) -> List[Tuple[str, str]]:
+        """
+        Find known classrooms that are free at a time or for a whole window.
+
+        Args:
+            day: Day abbreviation (e.g., "M")
+            start: Start of the window ("HHMM" or minutes after midnight)
+            end: End of the window (defaults to a single minute at start)
+            building: Optional building to restrict the search to
+
+        Returns:
+            Sorted list of (building, room) pairs; NON_CLASSROOM_BUILDINGS are only
+            searched when requested by building
+        """
+        if day not in DAY_BITS:
+            raise ValueError(f"Unknown day abbreviation: {day}")
+        start_minutes = hhmm_to_minutes(start)
+        end_minutes = hhmm_to_minutes(end) if end is not None else start_minutes + 1
+
+        free = []
+        for room_building, room in self.room_names:
+            if building and room_building != building:
+                continue
+            if not building and room_building in NON_CLASSROOM_BUILDINGS:
+                continue
+            timeline = self.rooms.get((room_building, room, day))
+            if timeline is None or timeline.is_free(start_minutes, end_minutes):
+                free.append((room_building, room))
+        return free
+
+    def sections_in_building(self, building: str, day: str, start: Time,
+                             end: Optional[Time] = None) -> List[Dict[str, Any]]:
+        """
+        Find the sections meeting in a building at a time or during a window.
+
+        Args:
+            building: Building code (e.g., "WAT")
+            day: Day abbreviation
+            start: Time, or start of the window ("HHMM" or minutes after midnight)
+            end: Optional end of the window
+
+        Returns:
+            List of section dictionaries (crn, course_id, room, start, end)
+        """
+        timeline = self.buildings.get((building, day))
+        if timeline is None:
+            return []
+        if end is None:
+            crns = timeline.at(hhmm_to_minutes(start))
+        else:
+            crns = timeline.overlapping(hhmm_to_minutes(start), hhmm_to_minutes(end))
+        return [{'crn': crn, **self.sections[crn]} for crn in crns]
+
+    def building_load(self, building: str, day: str) -> List[Tuple[int, int, int]]:
+        """
+        Number of concurrent sections in a building over a day.
+
+        Args:
+            building: Building code
+            day: Day abbreviation
+
+        Returns:
+            List of (start_minutes, end_minutes, sections) segments with at least one section
+        """
+        timeline = self.buildings.get((building, day))
+        return timeline.segments() if timeline else []
+
+    def peak_load(self, building: str, days: Iterable[str] = DAY_BITS) -> Optional[Dict[str, Any]]:
+        """
+        Find when a building is busiest.
+
+        Args:
+            building: Building code
+            days: Days to consider (defaults to every day)
+
+        Returns:
+            Dictionary with day, start, end (minutes after midnight) and sections count
+            for the first busiest segment, or None if the building is never used
+        """
+        peak = None
+        for day in days:
+            for start, end, count in self.building_load(building, day):
+                if peak is None or count > peak['sections']:
+                    peak = {'day': day, 'start': start, 'end': end, 'sections': count}
+        return peak
+
+
+if __name__ == "__main__":
+    import time
+
+    from section_table import load_subjects
+
+    index = RoomIndex.from_subjects(load_subjects())
+    print(f"Indexed {len(index.intervals)} physical sections in {len(index.room_names)} rooms")
+
+    runs = 1000
+    start_time = time.perf_counter()
+    for _ in range(runs):
+        free = index.free_rooms("T", "1100", "1220")
+    elapsed = (time.perf_counter() - start_time) / runs
+    print(f"{len(free)} rooms free Tuesday 11:00-12:20 ({elapsed * 1e6:.0f} microseconds per query)")
+
+    in_building = index.sections_in_building("WAT", "M", "1000")
+    print(f"Sections in WAT on Monday at 10:00: {[section['course_id'] for section in in_building]}")
+
+    peak = index.peak_load("WAT")
+    if peak:
+        print(f"WAT peak: {peak['sections']} sections on {peak['day']} "
+              f"{peak['start'] // 60:02d}:{peak['start'] % 60:02d}-{peak['end'] // 60:02d}:{peak['end'] % 60:02d}")
@@ -0,0 +1,175 @@
+"""
+This module contains time conflict detection and schedule generation over a SectionTable.
+
+A course is split into components, one per schedule type (e.g., Lecture and
+Laboratory). A schedule picks one section for every component of every requested
+course with no two timed sections overlapping. Schedules are generated lazily by
+backtracking, so callers can stream the first results without enumerating them all.
+"""
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from section_table import DAY_BITS, NO_TIME, SectionTable
+
+
+def sections_conflict(table: SectionTable, first: int, second: int) -> bool:
+    """
+    Check whether two sections meet at overlapping times on a shared day.
+
+    Args:
+        table: SectionTable containing both rows
+        first: Row index of the first section
+        second: Row index of the second section
+
+    Returns:
+        True if the sections overlap; sections without a meeting time never conflict
+    """
+    start, end, days = table['start_minutes'], table['end_minutes'], table['day_mask']
+    if start[first] == NO_TIME or start[second] == NO_TIME:
+        return False
+    if not days[first] & days[second]:
+        return False
+    return bool(start[first] < end[second] and start[second] < end[first])
+
+
+def conflict_matrix(table: SectionTable, rows: np.ndarray) -> np.ndarray:
+    """
+    Compute pairwise conflicts between a set of sections in one vectorized pass.
+
+    Args:
+        table: SectionTable containing the rows
+        rows: Row indices to compare
+
+    Returns:
+        Boolean matrix where [i, j] is True if rows[i] and rows[j] conflict
+    """
+    start = table['start_minutes'][rows].astype(np.int32)
+    end = table['end_minutes'][rows].astype(np.int32)
+    days = table['day_mask'][rows]
+    timed = start != NO_TIME
+
+    conflicts = (days[:, None] & days[None, :]) != 0
+    conflicts &= (start[:, None] < end[None, :]) & (start[None, :] < end[:, None])
+    conflicts &= timed[:, None] & timed[None, :]
+    np.fill_diagonal(conflicts, False)
+    return conflicts
+
+
+def build_components(table: SectionTable, course_ids: Iterable[str],
+                     mask: Optional[np.ndarray] = None) -> List[Tuple[str, str, np.ndarray]]:
+    """
+    Group the allowed sections of each course by schedule type.
+
+    Args:
+        table: SectionTable to search
+        course_ids: Courses the schedule must contain
+        mask: Optional boolean mask of allowed sections (e.g., from SectionTable.mask)
+
+    Returns:
+        List of (course_id, schedule type, row indices) components; a component
+        with no rows means the course cannot be scheduled under the mask
+    """
+    allowed = np.ones(len(table), dtype=bool) if mask is None else mask
+    types = table.labels('type')
+    components = []
+
+    for course_id in course_ids:
+        course_rows = np.flatnonzero(table.isin('course_id', [course_id]))
+        if len(course_rows) == 0:
+            components.append((course_id, '', course_rows))
+            continue
+        for section_type in dict.fromkeys(types[course_rows]):
+            type_rows = course_rows[types[course_rows] == section_type]
+            components.append((course_id, section_type, type_rows[allowed[type_rows]]))
+
+    return components
+
+
+def generate_schedules(table: SectionTable, course_ids: Iterable[str],
+                       mask: Optional[np.ndarray] = None,
+                       limit: Optional[int] = None) -> Iterator[List[int]]:
+    """
+    Lazily generate conflict-free schedules.
+
+    Args:
+        table: SectionTable to search
+        course_ids: Courses the schedule must contain
+        mask: Optional boolean mask of allowed sections
+        limit: Stop after this many schedules
+
+    Yields:
+        Lists of row indices, one per component
+    """
+    components = build_components(table, course_ids, mask)
+    if not components or any(len(rows) == 0 for _, _, rows in components):
+        return
+
+    # Search the most constrained components first
+    components.sort(key=lambda component: len(component[2]))
+    candidate_rows = np.unique(np.concatenate([rows for _, _, rows in components]))
+    position = {row: i for i, row in enumerate(candidate_rows)}
+    conflicts = conflict_matrix(table, candidate_rows)
+
+    chosen: List[int] = []
+    produced = 0
+
+    def search(depth: int) -> Iterator[List[int]]:
+        if depth == len(components):
+            yield list(chosen)
+            return
+        for row in components[depth][2]:
+            row_conflicts = conflicts[position[row]]
+            if any(row_conflicts[position[other]] for other in chosen):
+                continue
+            chosen.append(int(row))
+            yield from search(depth + 1)
+            chosen.pop()
+
+    for schedule in search(0):
+        yield schedule
+        produced += 1
+        if limit is not None and produced >= limit:
+            return
+
+
+def describe_schedule(table: SectionTable, rows: List[int]) -> List[Dict[str, Any]]:
+    """
+    Convert a schedule into readable section dictionaries.
+
+    Args:
+        table: SectionTable the schedule was generated from
+        rows: Row indices from generate_schedules()
+
+    Returns:
+        List of dictionaries with course, type, CRN, days and times for each section
+    """
+    described = []
+    for row in rows:
+        day_mask = int(table['day_mask'][row])
+        start = int(table['start_minutes'][row])
+        end = int(table['end_minutes'][row])
+        described.append({
+            'course_id': table.categories['course_id'][table['course_id'][row]],
+            'type': table.categories['type'][table['type'][row]],
+            'crn': str(table['crn'][row]),
+            'days': [day for day, bit in DAY_BITS.items() if day_mask & bit],
+            'startTime': f"{start // 60:02d}{start % 60:02d}" if start != NO_TIME else None,
+            'endTime': f"{end // 60:02d}{end % 60:02d}" if end != NO_TIME else None,
+            'available': int(table['available'][row]),
+        })
+    return described
+
+
+if __name__ == "__main__":
+    from section_table import load_section_table
+
+    table = load_section_table(subjects=["CS", "MATH"])
+    courses = ["CS010A", "MATH009A"]
+    mask = table.mask(exclude_days=["F"])
+
+    for i, schedule in enumerate(generate_schedules(table, courses, mask, limit=3), 1):
+        print(f"Schedule {i}:")
+        for section in describe_schedule(table, schedule):
+            print(f"  {section['course_id']} {section['type']} CRN {section['crn']} "
+                  f"{''.join(section['days'])} {section['startTime']}-{section['endTime']}")
@@ -1,11 +1,19 @@
 """
 This module contains the code to fetch course data from the UCR registration system.
 """
+import os
+
 import requests
-from bs4 import BeautifulSoup
+
+from prerequisite_extractor import extract_prerequisite_text
+
+
+# Root of the Banner registration site; override to point the scrapers at a mock server
+BASE_URL = os.environ.get("UCR_BANNER_BASE_URL", "https://registrationssb.ucr.edu").rstrip("/")
 
 
-def fetch_prerequisites(session: requests.Session, term: str, course_reference_number: str) -> str:
+def fetch_prerequisites(session: requests.Session, term: str, course_reference_number: str,
+                        base_url: str = BASE_URL) -> str:
     """
     Fetch prerequisite information for a specific course.
     
@@ -13,41 +21,25 @@ def fetch_prerequisites(session: requests.Session, term: str, course_reference_n
         session: Active requests session with UCR authentication
         term: Term code (e.g., "202440" for Fall 2024)
         course_reference_number: Course reference number (CRN)
+        base_url: Root URL of the Banner registration site
     
     Returns:
         str: Prerequisite text or empty string if none
     """
     try:
-        url = f"https://registrationssb.ucr.edu/StudentRegistrationSsb/ssb/searchResults/getSectionPrerequisites?term={term}&courseReferenceNumber={course_reference_number}"
+        url = f"{base_url}/StudentRegistrationSsb/ssb/searchResults/getSectionPrerequisites?term={term}&courseReferenceNumber={course_reference_number}"
         response = session.get(url)
         response.raise_for_status()
         
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Check if no prerequisites
-        if "No prerequisite information available" in response.text:
-            return ""
-        
-        # Extract prerequisite text from the structured HTML
-        prereq_section = soup.find('section', {'aria-labelledby': 'preReqs'})
-        if not prereq_section:
-            return ""
-        
-        # Get all <pre> tags which contain the prerequisite text
-        pre_tags = prereq_section.find_all('pre')
-        if not pre_tags:
-            return ""
-        
-        # Combine all prerequisite text
-        prerequisite_text = ''.join(tag.get_text().strip() for tag in pre_tags)
-        return prerequisite_text.strip() if prerequisite_text else ""
+        return extract_prerequisite_text(response.text)
         
     except Exception as e:
         print(f"Error fetching prerequisites for CRN {course_reference_number}: {e}")
         return ""
 
 
-def fetch_course_data(term: str = "202440", include_prerequisites: bool = True) -> list[dict]:
+def fetch_course_data(term: str = "202440", include_prerequisites: bool = True,
+                      base_url: str = BASE_URL) -> list[dict]:
     """
     Fetch course data from the UCR registration system.
     
@@ -55,6 +47,7 @@ def fetch_course_data(term: str = "202440", include_prerequisites: bool = True)
         term: Term code (e.g., "202440" for Fall 2024)
               Format: YYYY + QQ where QQ is 10=winter, 20=spring, 30=summer, 40=fall
         include_prerequisites: Whether to fetch prerequisite information for each course
+        base_url: Root URL of the Banner registration site
     
     Returns:
         list[dict]: A list of dictionaries, each containing course data.
@@ -62,19 +55,19 @@ def fetch_course_data(term: str = "202440", include_prerequisites: bool = True)
     
     # get session cookies
     session = requests.Session()
-    session.get("https://registrationssb.ucr.edu")
+    session.get(base_url)
     
     headers = {"Content-Type": "application/x-www-form-urlencoded; charset=UTF-8"}
     
     # initialize search session
     session.post(
-        "https://registrationssb.ucr.edu/StudentRegistrationSsb/ssb/term/search?mode=search",
+        f"{base_url}/StudentRegistrationSsb/ssb/term/search?mode=search",
         data={"term": term},
         headers=headers,
     )
     
     # get total count first
-    url = f"https://registrationssb.ucr.edu/StudentRegistrationSsb/ssb/searchResults/searchResults?txt_term={term}&pageOffset=0&pageMaxSize=1&sortColumn=subjectDescription&sortDirection=asc"
+    url = f"{base_url}/StudentRegistrationSsb/ssb/searchResults/searchResults?txt_term={term}&pageOffset=0&pageMaxSize=1&sortColumn=subjectDescription&sortDirection=asc"
     response = session.get(url, headers=headers)
     response.raise_for_status()
     
@@ -89,7 +82,7 @@ def fetch_course_data(term: str = "202440", include_prerequisites: bool = True)
     while page_offset < total_count:
         print(f"Fetching courses {page_offset} to {min(page_offset + page_size, total_count)}...")
         
-        url = f"https://registrationssb.ucr.edu/StudentRegistrationSsb/ssb/searchResults/searchResults?txt_term={term}&pageOffset={page_offset}&pageMaxSize={page_size}&sortColumn=subjectDescription&sortDirection=asc"
+        url = f"{base_url}/StudentRegistrationSsb/ssb/searchResults/searchResults?txt_term={term}&pageOffset={page_offset}&pageMaxSize={page_size}&sortColumn=subjectDescription&sortDirection=asc"
         response = session.get(url, headers=headers)
         response.raise_for_status()
         
@@ -116,7 +109,7 @@ def fetch_course_data(term: str = "202440", include_prerequisites: bool = True)
             
             crn = course.get("courseReferenceNumber")
             if crn:
-                prerequisites = fetch_prerequisites(session, term, crn)
+                prerequisites = fetch_prerequisites(session, term, crn, base_url)
                 course["prerequisites"] = prerequisites
     
     return courses
@@ -2,39 +2,64 @@
 This module contains the parallelized code to fetch course data from the UCR registration system.
 """
 import requests
-from bs4 import BeautifulSoup
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from threading import Lock
 import time
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
+
+from adaptive_concurrency import AdaptiveConcurrencyLimiter, request_with_retries
+from prerequisite_extractor import extract_prerequisite_text
+from scraper import BASE_URL
 
 
 class UCRCourseFetcher:
-    def __init__(self, max_workers: int = 20):
+    def __init__(self, max_workers: int = 20, min_workers: int = 2, base_url: str = BASE_URL):
         """
         Initialize the course fetcher with configurable concurrency.
         
+        The number of requests actually in flight is adjusted at run time by an
+        AdaptiveConcurrencyLimiter, between min_workers and max_workers.
+        
         Args:
             max_workers: Maximum number of concurrent threads for prerequisite fetching
+            min_workers: Minimum number of in-flight requests the limiters may drop to
+            base_url: Root URL of the Banner registration site
         """
         self.max_workers = max_workers
+        self.base_url = base_url.rstrip("/")
+        self.min_workers = min(min_workers, max_workers)
         self.session_lock = Lock()
+        self.prerequisite_limiter = self.create_limiter(max_workers)
+        self.page_limiter = None
+        self.failed_prerequisites: List[str] = []
+
+    def create_limiter(self, max_limit: int) -> AdaptiveConcurrencyLimiter:
+        """Create an adaptive limiter that starts halfway between the floor and max_limit."""
+        min_limit = min(self.min_workers, max_limit)
+        return AdaptiveConcurrencyLimiter(
+            initial_limit=max(min_limit, max_limit // 2),
+            min_limit=min_limit,
+            max_limit=max_limit,
+        )
         
     def create_session(self) -> requests.Session:
         """Create a new session with UCR authentication cookies."""
         session = requests.Session()
-        session.get("https://registrationssb.ucr.edu")
+        session.get(self.base_url)
         return session
 
-    def fetch_prerequisite_worker(self, args: Tuple[str, str, str]) -> Tuple[str, str]:
+    def fetch_prerequisite_worker(self, args: Tuple[str, str, str]) -> Tuple[str, Optional[str]]:
         """
         Worker function to fetch prerequisite for a single course.
         
+        Throttled, failed and timed-out requests are retried with backoff.
+        
         Args:
             args: Tuple of (term, course_reference_number, session_cookies)
         
         Returns:
-            Tuple of (course_reference_number, prerequisite_text)
+            Tuple of (course_reference_number, prerequisite_text); prerequisite_text is
+            None if the request still failed after retries
         """
         term, course_reference_number, session_cookies = args
         
@@ -43,33 +68,20 @@ class UCRCourseFetcher:
         session.cookies.update(session_cookies)
         
         try:
-            url = f"https://registrationssb.ucr.edu/StudentRegistrationSsb/ssb/searchResults/getSectionPrerequisites?term={term}&courseReferenceNumber={course_reference_number}"
-            response = session.get(url, timeout=30)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Check if no prerequisites
-            if "No prerequisite information available" in response.text:
-                return course_reference_number, ""
-            
-            # Extract prerequisite text from the structured HTML
-            prereq_section = soup.find('section', {'aria-labelledby': 'preReqs'})
-            if not prereq_section:
-                return course_reference_number, ""
-            
-            # Get all <pre> tags which contain the prerequisite text
-            pre_tags = prereq_section.find_all('pre')
-            if not pre_tags:
-                return course_reference_number, ""
-            
-            # Combine all prerequisite text
-            prerequisite_text = ''.join(tag.get_text().strip() for tag in pre_tags)
-            return course_reference_number, prerequisite_text.strip() if prerequisite_text else ""
+            url = f"{self.base_url}/StudentRegistrationSsb/ssb/searchResults/getSectionPrerequisites?term={term}&courseReferenceNumber={course_reference_number}"
+            response = request_with_retries(lambda: self._get(session, url), self.prerequisite_limiter)
+            return course_reference_number, extract_prerequisite_text(response.text)
             
         except Exception as e:
             print(f"Error fetching prerequisites for CRN {course_reference_number}: {e}")
-            return course_reference_number, ""
+            return course_reference_number, None
+
+    @staticmethod
+    def _get(session: requests.Session, url: str, **kwargs) -> requests.Response:
+        """GET a URL and raise for error statuses."""
+        response = session.get(url, timeout=30, **kwargs)
+        response.raise_for_status()
+        return response
 
     def fetch_prerequisites_parallel(self, courses: List[Dict], term: str, session: requests.Session) -> Dict[str, str]:
         """
@@ -81,7 +93,8 @@ class UCRCourseFetcher:
             session: Authenticated session
         
         Returns:
-            Dictionary mapping course_reference_number to prerequisite text
+            Dictionary mapping course_reference_number to prerequisite text; CRNs whose
+            requests failed after retries are left out and listed in failed_prerequisites
         """
         print(f"Fetching prerequisites for {len(courses)} courses using {self.max_workers} workers...")
         
@@ -94,6 +107,7 @@ class UCRCourseFetcher:
         
         # Track results
         prerequisites = {}
+        self.failed_prerequisites = []
         completed_count = 0
         start_time = time.time()
         
@@ -108,7 +122,10 @@ class UCRCourseFetcher:
             # Process completed tasks
             for future in as_completed(future_to_crn):
                 crn, prerequisite_text = future.result()
-                prerequisites[crn] = prerequisite_text
+                if prerequisite_text is None:
+                    self.failed_prerequisites.append(crn)
+                else:
+                    prerequisites[crn] = prerequisite_text
                 completed_count += 1
                 
                 # Progress update every 50 completions
@@ -118,10 +135,13 @@ class UCRCourseFetcher:
                     remaining = len(worker_args) - completed_count
                     eta = remaining / rate if rate > 0 else 0
                     print(f"Prerequisites: {completed_count}/{len(worker_args)} complete "
-                          f"({rate:.1f}/sec, ETA: {eta:.1f}s)")
+                          f"({rate:.1f}/sec, ETA: {eta:.1f}s, in-flight limit: {self.prerequisite_limiter.limit})")
         
         elapsed = time.time() - start_time
         print(f"Completed prerequisite fetching in {elapsed:.1f}s ({len(worker_args)/elapsed:.1f} requests/sec)")
+        print(f"Prerequisite limiter: {self.prerequisite_limiter.summary()}")
+        if self.failed_prerequisites:
+            print(f"Failed to fetch prerequisites for {len(self.failed_prerequisites)} CRNs after retries")
         
         return prerequisites
 
@@ -139,11 +159,9 @@ class UCRCourseFetcher:
             List of course dictionaries
         """
         headers = {"Content-Type": "application/x-www-form-urlencoded; charset=UTF-8"}
-        url = f"https://registrationssb.ucr.edu/StudentRegistrationSsb/ssb/searchResults/searchResults?txt_term={term}&pageOffset={page_offset}&pageMaxSize={page_size}&sortColumn=subjectDescription&sortDirection=asc"
-        
-        response = session.get(url, headers=headers, timeout=30)
-        response.raise_for_status()
+        url = f"{self.base_url}/StudentRegistrationSsb/ssb/searchResults/searchResults?txt_term={term}&pageOffset={page_offset}&pageMaxSize={page_size}&sortColumn=subjectDescription&sortDirection=asc"
         
+        response = request_with_retries(lambda: self._get(session, url, headers=headers), self.page_limiter)
         return response.json()["data"]
 
     def fetch_course_data_parallel(self, term: str = "202440", include_prerequisites: bool = True, 
@@ -155,12 +173,13 @@ class UCRCourseFetcher:
             term: Term code (e.g., "202440" for Fall 2024)
             include_prerequisites: Whether to fetch prerequisite information for each course
             batch_size: Number of courses to fetch per batch
-            course_batch_workers: Number of concurrent workers for course batch fetching
+            course_batch_workers: Maximum number of concurrent workers for course batch fetching
         
         Returns:
             List of dictionaries, each containing course data.
         """
         start_time = time.time()
+        self.page_limiter = self.create_limiter(course_batch_workers)
         
         # Create main session and initialize search
         session = self.create_session()
@@ -168,13 +187,13 @@ class UCRCourseFetcher:
         
         # Initialize search session
         session.post(
-            "https://registrationssb.ucr.edu/StudentRegistrationSsb/ssb/term/search?mode=search",
+            f"{self.base_url}/StudentRegistrationSsb/ssb/term/search?mode=search",
             data={"term": term},
             headers=headers,
         )
         
         # Get total count first
-        url = f"https://registrationssb.ucr.edu/StudentRegistrationSsb/ssb/searchResults/searchResults?txt_term={term}&pageOffset=0&pageMaxSize=1&sortColumn=subjectDescription&sortDirection=asc"
+        url = f"{self.base_url}/StudentRegistrationSsb/ssb/searchResults/searchResults?txt_term={term}&pageOffset=0&pageMaxSize=1&sortColumn=subjectDescription&sortDirection=asc"
         response = session.get(url, headers=headers)
         response.raise_for_status()
         
@@ -203,7 +222,7 @@ class UCRCourseFetcher:
             # Initialize each session
             for worker_session in sessions:
                 worker_session.post(
-                    "https://registrationssb.ucr.edu/StudentRegistrationSsb/ssb/term/search?mode=search",
+                    f"{self.base_url}/StudentRegistrationSsb/ssb/term/search?mode=search",
                     data={"term": term},
                     headers=headers,
                 )
@@ -219,20 +238,24 @@ class UCRCourseFetcher:
                 batch_data = future.result()
                 courses.extend(batch_data)
                 completed_batches += 1
-                print(f"Course batches: {completed_batches}/{len(batch_args)} complete")
+                print(f"Course batches: {completed_batches}/{len(batch_args)} complete "
+                      f"(in-flight limit: {self.page_limiter.limit})")
         
         print(f"Successfully fetched {len(courses)} courses")
+        print(f"Page limiter: {self.page_limiter.summary()}")
         
         # Fetch prerequisites in parallel if requested
         if include_prerequisites:
             prerequisites = self.fetch_prerequisites_parallel(courses, term, session)
             
-            # Add prerequisites to course data
+            # Add prerequisites to course data; courses whose fetch failed get no
+            # "prerequisites" key, so they are not mistaken for having none
+            failed = set(self.failed_prerequisites)
             for course in courses:
                 crn = course.get("courseReferenceNumber")
                 if crn and crn in prerequisites:
                     course["prerequisites"] = prerequisites[crn]
-                else:
+                elif crn not in failed:
                     course["prerequisites"] = ""
         
         total_time = time.time() - start_time
@@ -243,7 +266,8 @@ class UCRCourseFetcher:
 
 def fetch_course_data(term: str = "202440", include_prerequisites: bool = True, 
                      max_workers: int = 20, batch_size: int = 500, 
-                     course_batch_workers: int = 20) -> List[Dict]:
+                     course_batch_workers: int = 20, min_workers: int = 2,
+                     base_url: str = BASE_URL) -> List[Dict]:
     """
     Convenience function to fetch course data with default parallelization settings.
     
@@ -252,12 +276,14 @@ def fetch_course_data(term: str = "202440", include_prerequisites: bool = True,
         include_prerequisites: Whether to fetch prerequisite information
         max_workers: Maximum concurrent threads for prerequisite fetching
         batch_size: Number of courses per batch
-        course_batch_workers: Concurrent workers for course batch fetching
+        course_batch_workers: Maximum concurrent workers for course batch fetching
+        min_workers: Floor the adaptive limiters never drop below
+        base_url: Root URL of the Banner registration site
     
     Returns:
         List of course dictionaries
     """
-    fetcher = UCRCourseFetcher(max_workers=max_workers)
+    fetcher = UCRCourseFetcher(max_workers=max_workers, min_workers=min_workers, base_url=base_url)
     return fetcher.fetch_course_data_parallel(
         term=term, 
         include_prerequisites=include_prerequisites, 
@@ -267,12 +293,12 @@ def fetch_course_data(term: str = "202440", include_prerequisites: bool = True,
 
 
 if __name__ == "__main__":
-    # Example usage with different concurrency levels
-    print("Fetching with default settings (20 workers)...")
+    # Worker counts are ceilings; the adaptive limiters find the sustainable level
+    print("Fetching with default settings (up to 20 workers)...")
     courses = fetch_course_data()
     print(f"Fetched {len(courses)} courses")
     
-    # Example with more aggressive parallelization
-    # print("Fetching with high concurrency (50 workers)...")
+    # Example with a higher ceiling
+    # print("Fetching with up to 50 workers...")
     # courses = fetch_course_data(max_workers=50, course_batch_workers=5)
     # print(f"Fetched {len(courses)} courses")
\ No newline at end of file
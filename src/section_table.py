@@ -0,0 +1,337 @@
+"""
+This module exposes the processed course sections as a columnar table of NumPy arrays.
+
+Each section from data/processed/subjects/[SUBJECT].json becomes one row. String
+columns (subject, course_id, method, type, building, instructor) are stored as
+integer codes into a per-column category array, so filter predicates compile into
+vectorized boolean masks instead of Python loops over nested subject dictionaries.
+"""
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+import numpy as np
+
+
+# Bit assigned to each Banner day abbreviation in the day_mask column
+DAY_BITS = {'M': 1, 'T': 2, 'W': 4, 'R': 8, 'F': 16, 'S': 32, 'U': 64}
+
+# Sentinel stored in start_minutes/end_minutes for sections without a meeting time
+NO_TIME = -1
+
+# Columns stored as integer codes with a matching entry in SectionTable.categories
+CATEGORICAL_COLUMNS = ('subject', 'course_id', 'method', 'type', 'building', 'instructor')
+
+SUBJECTS_DIR = Path(__file__).parent.parent / 'data' / 'processed' / 'subjects'
+
+
+def hhmm_to_minutes(value: Union[str, int, None]) -> int:
+    """
+    Convert a Banner "HHMM" time into minutes after midnight.
+
+    Args:
+        value: Time as "HHMM" string (e.g., "1330"), minutes as int, or None
+
+    Returns:
+        Minutes after midnight, or NO_TIME if value is missing
+    """
+    if value is None or value == "":
+        return NO_TIME
+    if isinstance(value, int):
+        return value
+    return int(value[:-2] or 0) * 60 + int(value[-2:])
+
+
+def days_to_mask(days: Iterable[str]) -> int:
+    """
+    Convert a list of day abbreviations (e.g., ["M", "W", "F"]) into a day bitmask.
+
+    Args:
+        days: Iterable of abbreviations from DAY_BITS
+
+    Returns:
+        Integer bitmask with one bit per meeting day
+    """
+    mask = 0
+    for day in days:
+        mask |= DAY_BITS[day]
+    return mask
+
+
+def load_subjects(subjects_dir: Optional[Path] = None,
+                  subjects: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Load processed subject files into a single dictionary.
+
+    Args:
+        subjects_dir: Directory containing [SUBJECT].json files (defaults to data/processed/subjects)
+        subjects: Optional subset of subject codes to load
+
+    Returns:
+        Dictionary mapping subject code to its course dictionary
+    """
+    subjects_dir = Path(subjects_dir) if subjects_dir else SUBJECTS_DIR
+    if subjects is None:
+        files = sorted(subjects_dir.glob('*.json'))
+    else:
+        files = [subjects_dir / f"{subject}.json" for subject in subjects]
+
+    loaded = {}
+    for subject_file in files:
+        with open(subject_file, 'r', encoding='utf-8') as f:
+            loaded[subject_file.stem] = json.load(f)
+    return loaded
+
+
+class SectionTable:
+    """Columnar, NumPy-backed view over every section in the processed catalog."""
+
+    def __init__(self, columns: Dict[str, np.ndarray], categories: Dict[str, np.ndarray]):
+        """
+        Initialize the table from prebuilt columns.
+
+        Args:
+            columns: Mapping of column name to a NumPy array (all the same length)
+            categories: Mapping of categorical column name to its array of labels
+        """
+        self.columns = columns
+        self.categories = categories
+        self._codes = {
+            name: {label: code for code, label in enumerate(labels)}
+            for name, labels in categories.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.columns['crn'])
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    @classmethod
+    def from_subjects(cls, subjects: Dict[str, Dict[str, Any]]) -> 'SectionTable':
+        """
+        Build the table from processed subject data.
+
+        Args:
+            subjects: Dictionary of subject code -> course_id -> course entry,
+                      as produced by process_course_data.group_courses_by_subject
+
+        Returns:
+            SectionTable with one row per section
+        """
+        labels = {name: {} for name in CATEGORICAL_COLUMNS}
+        raw = {name: [] for name in CATEGORICAL_COLUMNS}
+        crn, start, end, day_mask = [], [], [], []
+        enrolled, capacity, available = [], [], []
+
+        def encode(name, value):
+            return labels[name].setdefault(value, len(labels[name]))
+
+        for subject, courses in subjects.items():
+            for course_id, course in courses.items():
+                for section in course['sections']:
+                    schedule = section['schedule']
+                    seats = section['availability']
+
+                    raw['subject'].append(encode('subject', subject))
+                    raw['course_id'].append(encode('course_id', course_id))
+                    raw['method'].append(encode('method', (section['method'] or '').strip()))
+                    raw['type'].append(encode('type', (section['type'] or '').strip()))
+                    raw['building'].append(encode('building', schedule['building'] or ''))
+                    raw['instructor'].append(encode('instructor', section['instructor'] or ''))
+
+                    crn.append(int(section['crn']))
+                    start.append(hhmm_to_minutes(schedule['startTime']))
+                    end.append(hhmm_to_minutes(schedule['endTime']))
+                    day_mask.append(days_to_mask(schedule['days']))
+                    enrolled.append(seats['enrolled'] or 0)
+                    capacity.append(seats['capacity'] or 0)
+                    available.append(seats['available'] or 0)
+
+        columns = {name: np.array(codes, dtype=np.int32) for name, codes in raw.items()}
+        columns.update({
+            'crn': np.array(crn, dtype=np.int64),
+            'start_minutes': np.array(start, dtype=np.int16),
+            'end_minutes': np.array(end, dtype=np.int16),
+            'day_mask': np.array(day_mask, dtype=np.uint8),
+            'enrolled': np.array(enrolled, dtype=np.int32),
+            'capacity': np.array(capacity, dtype=np.int32),
+            'available': np.array(available, dtype=np.int32),
+        })
+        categories = {name: np.array(list(values), dtype=object) for name, values in labels.items()}
+        return cls(columns, categories)
+
+    def labels(self, name: str) -> np.ndarray:
+        """
+        Decode a categorical column back into its string labels.
+
+        Args:
+            name: One of CATEGORICAL_COLUMNS
+
+        Returns:
+            Object array of labels, one per row
+        """
+        return self.categories[name][self.columns[name]]
+
+    def isin(self, name: str, values: Iterable[str]) -> np.ndarray:
+        """
+        Build a mask selecting rows whose categorical column matches any of the values.
+
+        Args:
+            name: One of CATEGORICAL_COLUMNS
+            values: Labels to match (unknown labels are ignored)
+
+        Returns:
+            Boolean mask over all rows
+        """
+        lookup = np.zeros(len(self.categories[name]), dtype=bool)
+        codes = [self._codes[name][value] for value in values if value in self._codes[name]]
+        lookup[codes] = True
+        return lookup[self.columns[name]]
+
+    def mask(self, subjects: Optional[Iterable[str]] = None,
+             course_ids: Optional[Iterable[str]] = None,
+             methods: Optional[Iterable[str]] = None,
+             types: Optional[Iterable[str]] = None,
+             buildings: Optional[Iterable[str]] = None,
+             instructors: Optional[Iterable[str]] = None,
+             exclude_days: Iterable[str] = (),
+             start_after: Union[str, int, None] = None,
+             end_before: Union[str, int, None] = None,
+             open_only: bool = False,
+             min_available: int = 0) -> np.ndarray:
+        """
+        Compile filter predicates into a single vectorized boolean mask.
+
+        All predicates are combined with AND; predicates left as None are ignored.
+        Time predicates only match sections with a scheduled meeting time, while
+        exclude_days keeps sections without meeting days.
+
+        Args:
+            subjects: Subject codes to keep (e.g., ["CS", "MATH"])
+            course_ids: Course ids to keep (e.g., ["CS010A"])
+            methods: Instructional methods to keep (e.g., ["In-Person"])
+            types: Schedule types to keep (e.g., ["Lecture", "Discussion"])
+            buildings: Buildings to keep
+            instructors: Instructor display names to keep (e.g., ["Evtushenko, Anna"])
+            exclude_days: Day abbreviations the section must not meet on (e.g., ["F"])
+            start_after: Earliest allowed start time ("HHMM" or minutes after midnight)
+            end_before: Latest allowed end time ("HHMM" or minutes after midnight)
+            open_only: Only keep sections with at least one available seat
+            min_available: Minimum number of available seats
+
+        Returns:
+            Boolean mask over all rows
+        """
+        mask = np.ones(len(self), dtype=bool)
+
+        for name, values in (('subject', subjects), ('course_id', course_ids),
+                             ('method', methods), ('type', types), ('building', buildings),
+                             ('instructor', instructors)):
+            if values is not None:
+                mask &= self.isin(name, values)
+
+        excluded = days_to_mask(exclude_days)
+        if excluded:
+            mask &= (self.columns['day_mask'] & excluded) == 0
+
+        if start_after is not None:
+            mask &= self.columns['start_minutes'] >= hhmm_to_minutes(start_after)
+        if end_before is not None:
+            end = self.columns['end_minutes']
+            mask &= (end != NO_TIME) & (end <= hhmm_to_minutes(end_before))
+
+        if open_only:
+            min_available = max(min_available, 1)
+        if min_available:
+            mask &= self.columns['available'] >= min_available
+
+        return mask
+
+    def take(self, mask: np.ndarray) -> 'SectionTable':
+        """
+        Select a subset of rows.
+
+        Args:
+            mask: Boolean mask or integer index array
+
+        Returns:
+            New SectionTable sharing this table's categories
+        """
+        return SectionTable({name: column[mask] for name, column in self.columns.items()}, self.categories)
+
+    def filter(self, **predicates) -> 'SectionTable':
+        """
+        Select the rows matching the given predicates (see SectionTable.mask).
+
+        Returns:
+            New SectionTable containing only matching rows
+        """
+        return self.take(self.mask(**predicates))
+
+    def fill_rate(self) -> np.ndarray:
+        """
+        Compute enrolled / capacity for every row (0 where capacity is 0).
+
+        Returns:
+            Float array of fill rates
+        """
+        capacity = self.columns['capacity']
+        return np.divide(self.columns['enrolled'], capacity,
+                         out=np.zeros(len(self), dtype=np.float64), where=capacity > 0)
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """
+        Convert the table back into a list of flat row dictionaries.
+
+        Returns:
+            List of dictionaries with decoded labels, one per row
+        """
+        decoded = {name: self.labels(name) for name in CATEGORICAL_COLUMNS}
+        records = []
+        for i in range(len(self)):
+            record = {name: decoded[name][i] for name in CATEGORICAL_COLUMNS}
+            record.update({name: column[i].item() for name, column in self.columns.items()
+                           if name not in CATEGORICAL_COLUMNS})
+            records.append(record)
+        return records
+
+
+def load_section_table(subjects_dir: Optional[Path] = None,
+                       subjects: Optional[Iterable[str]] = None) -> SectionTable:
+    """
+    Load processed subject files into a SectionTable.
+
+    Args:
+        subjects_dir: Directory containing [SUBJECT].json files (defaults to data/processed/subjects)
+        subjects: Optional subset of subject codes to load
+
+    Returns:
+        SectionTable over all loaded sections
+    """
+    return SectionTable.from_subjects(load_subjects(subjects_dir, subjects))
+
+
+if __name__ == "__main__":
+    import time
+
+    table = load_section_table()
+    print(f"Loaded {len(table)} sections")
+
+    # "Open in-person sections, no Fridays, after 10am, in CS or MATH"
+    predicates = dict(subjects=["CS", "MATH"], methods=["In-Person"],
+                      exclude_days=["F"], start_after="1000", open_only=True)
+
+    runs = 1000
+    start_time = time.perf_counter()
+    for _ in range(runs):
+        mask = table.mask(**predicates)
+    elapsed = (time.perf_counter() - start_time) / runs
+
+    print(f"Matched {int(mask.sum())} sections in {elapsed * 1e6:.1f} microseconds per filter")
+    for record in table.take(mask).to_records()[:5]:
+        print(f"  {record['course_id']} CRN {record['crn']} ({record['type']}) "
+              f"{record['available']}/{record['capacity']} seats")
+
+    lectures = table.filter(types=["Lecture"], methods=["In-Person"])
+    print(f"Mean in-person lecture fill rate: {lectures.fill_rate().mean():.1%}")